@@ -1,28 +1,506 @@
 from typing import Optional, Literal
 
-@mcp.tool()
-async def PubChem_search_compounds(
-    query: str,
-    search_type: Literal['name', 'smiles', 'inchi', 'sdf', 'cid', 'formula'] = 'name',
-    max_records: int = 100
-) -> str:
+import asyncio
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+
+import anyio
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
+from mcp.types import CONNECTION_CLOSED, ErrorData
+
+# PubChem MCP 서버 실행 설정 (로컬 대역 서버로 교체 가능하도록 환경변수로 조정)
+PUBCHEM_MCP_COMMAND = os.getenv("PUBCHEM_MCP_COMMAND", "node")
+PUBCHEM_MCP_SERVER_PATH = os.getenv("PUBCHEM_MCP_SERVER_PATH", "/app/PubChem-MCP-Server/build/index.js")
+PUBCHEM_MCP_POOL_SIZE = int(os.getenv("PUBCHEM_MCP_POOL_SIZE", "4"))
+PUBCHEM_MCP_CALL_TIMEOUT = float(os.getenv("PUBCHEM_MCP_CALL_TIMEOUT", "60"))
+# 마지막 사용 후 이 시간(초)이 지난 세션은 꺼내기 전에 ping으로 상태 확인
+PUBCHEM_MCP_HEALTHCHECK_SEC = float(os.getenv("PUBCHEM_MCP_HEALTHCHECK_SEC", "30"))
+# 서버 재시작 간 최대 대기 시간(초)
+PUBCHEM_MCP_MAX_BACKOFF = 30.0
+
+# 검색 결과 캐시 설정
+PUBCHEM_CACHE_TTL = float(os.getenv("PUBCHEM_CACHE_TTL", "86400"))
+PUBCHEM_CACHE_NEGATIVE_TTL = float(os.getenv("PUBCHEM_CACHE_NEGATIVE_TTL", "60"))
+PUBCHEM_CACHE_ERROR_TTL = float(os.getenv("PUBCHEM_CACHE_ERROR_TTL", "10"))
+PUBCHEM_CACHE_MAX_ENTRIES = int(os.getenv("PUBCHEM_CACHE_MAX_ENTRIES", "1024"))
+# 지정 시 sqlite 파일에 정상 결과를 저장해 재시작 후에도 재사용 (빈 값이면 메모리 전용)
+PUBCHEM_CACHE_PATH = os.getenv("PUBCHEM_CACHE_PATH", "")
+# 만료된 디스크 항목 정리 주기(초)
+PUBCHEM_CACHE_PRUNE_INTERVAL = float(os.getenv("PUBCHEM_CACHE_PRUNE_INTERVAL", "600"))
+
+# PubChem 사용 정책(초당 5회 이하)에 맞춘 업스트림 호출 속도 제한
+PUBCHEM_MAX_RPS = float(os.getenv("PUBCHEM_MAX_RPS", "5"))
+PUBCHEM_BATCH_MAX_QUERIES = int(os.getenv("PUBCHEM_BATCH_MAX_QUERIES", "100"))
+
+NO_RESULT_MESSAGE = "No result found or empty response."
+
+# 필드 projection용 별칭 (서버 응답의 키 표기가 달라도 같은 필드로 매칭)
+FIELD_ALIASES = {
+    "cid": ["cid", "CID"],
+    "name": ["name", "title", "Title", "iupac_name", "IUPACName"],
+    "formula": ["molecular_formula", "MolecularFormula", "formula"],
+    "weight": ["molecular_weight", "MolecularWeight", "weight"],
+    "smiles": ["canonical_smiles", "CanonicalSMILES", "smiles", "SMILES",
+               "isomeric_smiles", "IsomericSMILES", "ConnectivitySMILES"],
+}
+
+
+def _is_connection_error(e: BaseException) -> bool:
+    """서버 프로세스 종료/파이프 끊김으로 인한 실패인지 판별 (다른 세션으로 재시도할 대상)"""
+    if isinstance(e, McpError):
+        return e.error.code == CONNECTION_CLOSED
+    return isinstance(e, (anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream, OSError))
+
+
+class _PooledSession:
+    """
+    장기 실행되는 MCP 서버 프로세스 1개와 ClientSession 1개를 소유하는 슬롯.
+    stdio_client/ClientSession 컨텍스트는 같은 태스크에서 열고 닫아야 하므로 전용 태스크에서 관리한다.
     """
-    Search PubChem database for chemical compounds
 
-    Args:
-        query (str): Search query (compound name, CAS, formula, or identifier) (필수).
-        search_type (Literal['name', 'smiles', 'inchi', 'sdf', 'cid', 'formula'], optional): Type of search to perform (검색 유형). Defaults to 'name'.
-        max_records (int, optional): Maximum number of results (최대 결과 수, 기본값: 100).
+    def __init__(self, pool: "MCPSessionPool", index: int):
+        self.pool = pool
+        self.index = index
+        self.session: Optional[ClientSession] = None
+        # 서버를 새로 띄울 때마다 증가. 풀에 남은 이전 세대 항목을 걸러내는 데 사용
+        self.generation = 0
+        self.last_used = 0.0
+        self.restarts = 0
+        # True면 더 이상 서버를 재시작하지 않음 (풀 종료, 취소, 이벤트 루프 교체)
+        self.stopped = False
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
 
-    Returns:
-        str: contexts of PubChem compound records
+    def start(self):
+        self._task = asyncio.create_task(self._run(), name=f"pubchem-mcp-{self.index}")
+
+    async def _relay(self, read, relay_send):
+        """서버 stdout 스트림을 ClientSession으로 중계하다가 EOF(프로세스 종료)를 만나면 즉시 재시작"""
+        try:
+            async with relay_send:
+                async for message in read:
+                    await relay_send.send(message)
+        except (anyio.ClosedResourceError, anyio.BrokenResourceError):
+            pass
+        finally:
+            # 요청 실패를 기다리지 않고 바로 꺼내 쓸 수 없는 상태로 표시
+            self.session = None
+            self._stop.set()
+
+    async def _run(self):
+        backoff = 0.5
+        while not (self.pool.closed or self.stopped):
+            self._stop.clear()
+            relay_task = None
+            try:
+                async with stdio_client(self.pool.server_params) as (read, write):
+                    relay_send, relay_recv = anyio.create_memory_object_stream(0)
+                    relay_task = asyncio.create_task(self._relay(read, relay_send))
+                    async with ClientSession(relay_recv, write) as session:
+                        await session.initialize()
+                        if not self._stop.is_set():
+                            self.session = session
+                            self.generation += 1
+                            self.last_used = time.monotonic()
+                            backoff = 0.5
+                            self.pool._idle.put_nowait((self, self.generation))
+                        await self._stop.wait()
+            except asyncio.CancelledError:
+                self.stopped = True
+                raise
+            except Exception as e:
+                print(f"PubChem MCP server #{self.index} failed: {type(e).__name__}: {e}")
+            finally:
+                self.session = None
+                if relay_task is not None:
+                    relay_task.cancel()
+
+            # stdio_client/ClientSession의 anyio task group이 CancelledError를 삼키는 경우가 있어
+            # 태스크의 취소 요청 여부를 직접 확인 (asyncio.run 종료 시 서버를 다시 띄우지 않도록)
+            task = asyncio.current_task()
+            if task is not None and getattr(task, "cancelling", lambda: 0)():
+                self.stopped = True
+                raise asyncio.CancelledError
+            if self.pool.closed or self.stopped:
+                break
+            # 크래시/헬스체크 실패 → 백오프 후 재시작
+            self.restarts += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, PUBCHEM_MCP_MAX_BACKOFF)
+
+    def restart(self, generation: Optional[int] = None):
+        # 이미 새 서버로 교체된 뒤의 늦은 재시작 요청은 무시
+        if generation is None or generation == self.generation:
+            self._stop.set()
+
+    async def stop(self):
+        self.stopped = True
+        self._stop.set()
+        if self._task:
+            try:
+                await asyncio.wait_for(self._task, timeout=5)
+            except (asyncio.TimeoutError, asyncio.CancelledError, Exception):
+                self._task.cancel()
+
+    async def call_tool(self, session: ClientSession, name: str, arguments: dict, timeout: float):
+        """
+        서버가 응답 도중 종료되면 ClientSession이 대기 중인 요청을 깨우지 못하고 타임아웃까지 기다리므로,
+        슬롯의 종료 신호와 경쟁시켜 즉시 연결 오류로 실패시킨다.
+        """
+        call = asyncio.ensure_future(session.call_tool(name=name, arguments=arguments))
+        stopped = asyncio.ensure_future(self._stop.wait())
+        try:
+            done, _ = await asyncio.wait({call, stopped}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            stopped.cancel()
+            if not call.done():
+                call.cancel()
+        if call in done:
+            return call.result()
+        if stopped in done:
+            raise McpError(ErrorData(code=CONNECTION_CLOSED, message="PubChem MCP server exited during the call"))
+        raise asyncio.TimeoutError("PubChem MCP call timed out")
+
+    async def healthy(self) -> bool:
+        if self.session is None:
+            return False
+        if time.monotonic() - self.last_used < PUBCHEM_MCP_HEALTHCHECK_SEC:
+            return True
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=5)
+            return True
+        except Exception:
+            return False
+
+
+class MCPSessionPool:
     """
-    import json
-    from mcp import ClientSession, StdioServerParameters
-    from mcp.client.stdio import stdio_client
-    import os
-    from typing import Literal # Literal 타입 정의를 위해 재선언
+    초기화가 끝난 MCP ClientSession을 재사용하는 풀.
+    요청마다 node 프로세스를 띄우고 핸드셰이크하던 비용을 없앤다.
+    호스트 종료 시에는 pubchem_lifespan()을 호스트의 lifespan으로 사용하거나 close()를 await 한다.
+    close() 없이 이벤트 루프가 끝나도(asyncio.run 종료 시 태스크 취소) 서버 프로세스는 함께 종료된다.
+    """
+
+    def __init__(self, server_params: StdioServerParameters, size: int = PUBCHEM_MCP_POOL_SIZE):
+        self.server_params = server_params
+        self.size = max(1, size)
+        self.closed = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._slots: list[_PooledSession] = []
+
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        # 최초 호출(또는 이벤트 루프가 바뀐 경우)에 서버들을 띄운다
+        if self._slots:
+            self._stop_slots(self._loop, self._slots)
+        self._loop = loop
+        self._idle = asyncio.Queue()
+        self._slots = [_PooledSession(self, i) for i in range(self.size)]
+        for slot in self._slots:
+            slot.start()
+
+    @staticmethod
+    def _stop_slots(loop: Optional[asyncio.AbstractEventLoop], slots: list[_PooledSession]):
+        """이전 이벤트 루프에 남은 슬롯이 서버를 재시작하지 않도록 멈춤"""
+        for slot in slots:
+            slot.stopped = True
+        if loop is None or loop.is_closed():
+            # 루프가 닫혔으면 태스크도 끝난 상태 (asyncio.run은 종료 시 태스크를 취소함)
+            return
+        if loop.is_running():
+            # 다른 스레드에서 돌고 있는 루프: 그 루프에서 stop()을 실행해 서버 프로세스를 정리
+            for slot in slots:
+                asyncio.run_coroutine_threadsafe(slot.stop(), loop)
+        else:
+            # 멈춘 루프: 다음에 루프가 돌 때 슬롯 태스크가 바로 종료되도록 신호만 남김
+            for slot in slots:
+                slot._stop.set()
+
+    async def _checkout(self, deadline: float) -> tuple[_PooledSession, int]:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError("Timed out waiting for a PubChem MCP session")
+            slot, generation = await asyncio.wait_for(self._idle.get(), timeout=remaining)
+            if generation != slot.generation:
+                # 재시작 전 세대의 항목 (새 세대는 _run이 다시 넣어둠)
+                continue
+            try:
+                ok = await slot.healthy()
+            except BaseException:
+                slot.restart(generation)
+                raise
+            if ok:
+                return slot, generation
+            slot.restart(generation)
+
+    async def call_tool(self, name: str, arguments: dict, timeout: float = PUBCHEM_MCP_CALL_TIMEOUT):
+        if self.closed:
+            raise RuntimeError("PubChem MCP session pool is closed")
+        self._ensure_started()
+
+        deadline = time.monotonic() + timeout
+        # 서버 프로세스가 죽어 실패한 경우에만 다른 세션으로 한 번 재시도
+        for attempt in range(2):
+            slot, generation = await self._checkout(deadline)
+            try:
+                result = await slot.call_tool(
+                    slot.session, name, arguments, timeout=max(deadline - time.monotonic(), 0.001),
+                )
+            except BaseException as e:
+                if isinstance(e, Exception) and not (_is_connection_error(e) or isinstance(e, asyncio.TimeoutError)):
+                    # 잘못된 인자/알 수 없는 도구 같은 프로토콜 오류는 세션이 정상이므로 그대로 반납
+                    slot.last_used = time.monotonic()
+                    self._idle.put_nowait((slot, generation))
+                    raise
+                # 연결 끊김/타임아웃/취소: 세션 상태를 신뢰할 수 없으므로 서버를 재시작하고 풀에 돌려놓지 않는다
+                slot.restart(generation)
+                if attempt == 0 and isinstance(e, Exception) and _is_connection_error(e):
+                    continue
+                raise
+            slot.last_used = time.monotonic()
+            self._idle.put_nowait((slot, generation))
+            return result
+
+    def stats(self) -> dict:
+        return {
+            "size": self.size,
+            "idle": self._idle.qsize() if self._idle else 0,
+            "alive": sum(1 for s in self._slots if s.session is not None),
+            "restarts": sum(s.restarts for s in self._slots),
+        }
+
+    async def close(self):
+        self.closed = True
+        await asyncio.gather(*(slot.stop() for slot in self._slots), return_exceptions=True)
+
+
+pubchem_session_pool = MCPSessionPool(
+    StdioServerParameters(
+        command=PUBCHEM_MCP_COMMAND,
+        args=[PUBCHEM_MCP_SERVER_PATH],
+        env=os.environ.copy()
+    )
+)
+
+
+@asynccontextmanager
+async def pubchem_lifespan(server=None):
+    """
+    FastMCP(lifespan=pubchem_lifespan) 또는 호스트의 lifespan/AsyncExitStack에 연결하는 종료 훅.
+    빠져나갈 때 풀의 PubChem MCP 서버 프로세스를 모두 정리한다.
+    """
+    try:
+        yield
+    finally:
+        await pubchem_session_pool.close()
+
+
+class ResultCache:
+    """
+    TTL + LRU 메모리 캐시. persist_path가 주어지면 정상 결과를 sqlite에도 저장한다.
+    메모리 히트는 dict 조회 한 번으로 끝나고, 디스크는 메모리 미스일 때만 조회한다.
+    sqlite 읽기/쓰기는 이벤트 루프를 막지 않도록 스레드에서 실행한다.
+    """
+
+    def __init__(self, max_entries: int = PUBCHEM_CACHE_MAX_ENTRIES, persist_path: str = PUBCHEM_CACHE_PATH):
+        self.max_entries = max(1, max_entries)
+        self.persist_path = persist_path
+        self._entries: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        # 여러 워커 스레드가 같은 커넥션을 쓰므로 직렬화
+        self._db_lock = threading.Lock()
+        self._last_prune = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(query: str, search_type: str, max_records: int) -> str:
+        normalized = " ".join(str(query).split())
+        # 이름 검색만 대소문자 무시 (SMILES/InChI/분자식은 대소문자가 의미를 가짐)
+        if search_type == "name":
+            normalized = normalized.lower()
+        return json.dumps([normalized, search_type, max_records], ensure_ascii=False)
+
+    def _get_db(self) -> sqlite3.Connection:
+        # _db_lock을 잡은 상태에서만 호출
+        if self._db is None:
+            self._db = sqlite3.connect(self.persist_path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS pubchem_cache (key TEXT PRIMARY KEY, expires_at REAL, value TEXT)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS pubchem_cache_expires_at ON pubchem_cache (expires_at)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _put_memory(self, key: str, expires_at: float, value: str):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _disk_get(self, key: str) -> Optional[tuple[float, str]]:
+        try:
+            with self._db_lock:
+                return self._get_db().execute(
+                    "SELECT expires_at, value FROM pubchem_cache WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"PubChem cache read failed: {e}")
+            return None
+
+    def _disk_set(self, key: str, expires_at: float, value: str):
+        try:
+            with self._db_lock:
+                db = self._get_db()
+                db.execute(
+                    "INSERT OR REPLACE INTO pubchem_cache (key, expires_at, value) VALUES (?, ?, ?)",
+                    (key, expires_at, value),
+                )
+                # 만료 항목 정리는 매 쓰기가 아니라 주기적으로만 수행
+                now = time.time()
+                if now - self._last_prune >= PUBCHEM_CACHE_PRUNE_INTERVAL:
+                    db.execute("DELETE FROM pubchem_cache WHERE expires_at <= ?", (now,))
+                    self._last_prune = now
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"PubChem cache write failed: {e}")
+
+    async def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+
+        if self.persist_path:
+            row = await asyncio.to_thread(self._disk_get, key)
+            if row is not None and row[0] > time.time():
+                self._put_memory(key, row[0], row[1])
+                self.hits += 1
+                self.disk_hits += 1
+                return row[1]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: str, ttl: float, persist: bool = True):
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        self._put_memory(key, expires_at, value)
+
+        if persist and self.persist_path:
+            await asyncio.to_thread(self._disk_set, key, expires_at, value)
+
+    def clear(self):
+        self._entries.clear()
+        if self.persist_path:
+            with self._db_lock:
+                db = self._get_db()
+                db.execute("DELETE FROM pubchem_cache")
+                db.commit()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+pubchem_result_cache = ResultCache()
 
+
+class RateLimiter:
+    """토큰 버킷 방식의 비동기 속도 제한기 (rate: 초당 허용 횟수, burst: 순간 허용량)"""
+
+    def __init__(self, rate: float = PUBCHEM_MAX_RPS, burst: Optional[int] = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1, int(rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self):
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # 락을 잡은 순서대로 토큰을 받으므로 대기 순서가 공정하다
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+pubchem_rate_limiter = RateLimiter()
+
+# 진행 중인 업스트림 조회 (동일 키 요청은 하나의 호출을 공유)
+_inflight: dict[str, asyncio.Task] = {}
+
+
+async def _fetch_compounds(cache_key: str, cleaned_args: dict) -> str:
+    try:
+        await pubchem_rate_limiter.acquire()
+        # 풀에서 초기화된 세션을 꺼내 구성된 dict를 arguments로 전달
+        result = await pubchem_session_pool.call_tool(name="search_compounds", arguments=cleaned_args)
+
+        text = result.content[0].text if result.content else None
+
+        if result.isError:
+            # 서버가 돌려준 오류 응답(레이트 리밋 등)은 정상 결과로 캐시하지 않음
+            message = text or "Error executing Node.js tool: empty error response"
+            if not message.startswith("Error"):
+                message = f"Error executing Node.js tool: {message}"
+            await pubchem_result_cache.set(cache_key, message, PUBCHEM_CACHE_ERROR_TTL, persist=False)
+            return message
+
+        if text is not None:
+            await pubchem_result_cache.set(cache_key, text, PUBCHEM_CACHE_TTL)
+            return text
+        # 결과 없음은 짧게만 캐시하고 디스크에는 남기지 않음
+        await pubchem_result_cache.set(cache_key, NO_RESULT_MESSAGE, PUBCHEM_CACHE_NEGATIVE_TTL, persist=False)
+        return NO_RESULT_MESSAGE
+    except Exception as e:
+        message = f"Error executing Node.js tool: {type(e).__name__}: {str(e)}"
+        # 장애 시 같은 요청이 몰려 서버를 두드리지 않도록 아주 짧게 캐시
+        await pubchem_result_cache.set(cache_key, message, PUBCHEM_CACHE_ERROR_TTL, persist=False)
+        return message
+    finally:
+        _inflight.pop(cache_key, None)
+
+
+async def _search_compounds(query: str, search_type: str = 'name', max_records: int = 100) -> str:
     # 인자를 툴이 기대하는 dict 형태로 구성
     input_args = {
         "query": query,
@@ -32,29 +510,219 @@ async def PubChem_search_compounds(
 
     # None이 아닌 유효한 인자만 arguments dict에 포함
     cleaned_args = {k: v for k, v in input_args.items() if v is not None}
-    
+
     if not cleaned_args.get("query"):
         return "Error: The 'query' search term is required."
 
-    # 경로 설정
-    SERVER_jw_PATH = "/app/PubChem-MCP-Server/build/index.js"
+    cache_key = ResultCache.make_key(cleaned_args["query"], search_type, max_records)
+    cached = await pubchem_result_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    task = _inflight.get(cache_key)
+    if task is None:
+        task = asyncio.create_task(_fetch_compounds(cache_key, cleaned_args))
+        _inflight[cache_key] = task
+    # 한 호출자가 취소되어도 같은 조회를 기다리는 다른 호출자에게 영향이 없도록 shield
+    return await asyncio.shield(task)
 
-    server_params = StdioServerParameters(
-        command="node",
-        args=[SERVER_jw_PATH],
-        env=os.environ.copy()
-    )
 
+def _extract_records(text: str) -> Optional[tuple[dict, list]]:
+    """서버 응답 JSON에서 레코드 목록을 찾아 (원본 객체, 레코드 리스트) 반환. 구조를 모르면 None"""
     try:
-        async with stdio_client(server_params) as (read, write):
-            async with ClientSession(read, write) as session:
-                await session.initialize()
-                
-                # 구성된 dict를 arguments로 전달
-                result = await session.call_tool(name="search_compounds", arguments=cleaned_args)
-                
-                if result.content and len(result.content) > 0:
-                    return result.content[0].text
-                return "No result found or empty response."
-    except Exception as e:
-        return f"Error executing Node.js tool: {str(e)}"
\ No newline at end of file
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        return None
+    if isinstance(data, list):
+        return {}, data
+    if isinstance(data, dict):
+        # PUG REST 형식 ({"PropertyTable": {"Properties": [...]}}) 도 지원
+        container = data.get("PropertyTable") if isinstance(data.get("PropertyTable"), dict) else data
+        for key in ("compounds", "results", "records", "Properties"):
+            if isinstance(container.get(key), list):
+                return data, container[key]
+        for value in data.values():
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                return data, value
+    return None
+
+
+def _project(record, fields: Optional[list[str]]):
+    if not fields or not isinstance(record, dict):
+        return record
+    projected = {}
+    for field in fields:
+        for candidate in FIELD_ALIASES.get(field.lower(), [field]):
+            if candidate in record:
+                projected[field] = record[candidate]
+                break
+        else:
+            projected[field] = None
+    return projected
+
+
+def _encode_cursor(query: str, search_type: str, max_records: int, offset: int,
+                   fields: Optional[list[str]], output_format: str, page_size: int) -> str:
+    # 커서만 넘겨도 첫 페이지와 같은 형태가 나오도록 projection/포맷/페이지 크기까지 저장
+    raw = json.dumps([query, search_type, max_records, offset, fields, output_format, page_size], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str) -> tuple[str, str, int, int, Optional[list[str]], str, int]:
+    query, search_type, max_records, offset, fields, output_format, page_size = json.loads(
+        base64.urlsafe_b64decode(cursor.encode("ascii"))
+    )
+    # 조작된 커서로 음수/실수/문자열 오프셋이 들어오지 않도록 정수만 허용
+    for value in (max_records, offset, page_size):
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError("invalid cursor")
+    if not isinstance(query, str) or not isinstance(search_type, str):
+        raise ValueError("invalid cursor")
+    if fields is not None and not (isinstance(fields, list) and all(isinstance(f, str) for f in fields)):
+        raise ValueError("invalid cursor")
+    if output_format not in ("json", "table"):
+        raise ValueError("invalid cursor")
+    return query, search_type, max_records, offset, fields, output_format, page_size
+
+
+def _format_table(rows: list) -> str:
+    if not rows:
+        return ""
+    columns = []
+    for row in rows:
+        for key in (row if isinstance(row, dict) else {}):
+            if key not in columns:
+                columns.append(key)
+    if not columns:
+        return "\n".join(json.dumps(r, ensure_ascii=False) for r in rows)
+    lines = ["\t".join(columns)]
+    for row in rows:
+        cells = []
+        for col in columns:
+            value = row.get(col)
+            cells.append("" if value is None else str(value).replace("\t", " ").replace("\n", " "))
+        lines.append("\t".join(cells))
+    return "\n".join(lines)
+
+
+def _shape_result(text: str, query: str, search_type: str, max_records: int,
+                  fields: Optional[list[str]], output_format: str,
+                  offset: int = 0, page_size: Optional[int] = None) -> str:
+    """전체 결과(text)에 projection/페이지네이션/포맷 적용. 레코드 구조를 알 수 없으면 원문 반환"""
+    if text.startswith("Error") or text == NO_RESULT_MESSAGE:
+        return text
+    extracted = _extract_records(text)
+    if extracted is None:
+        return text
+    _, records = extracted
+
+    total = len(records)
+    end = total if page_size is None else min(offset + max(1, page_size), total)
+    page = [_project(r, fields) for r in records[offset:end]]
+    next_cursor = None
+    if end < total:
+        next_cursor = _encode_cursor(query, search_type, max_records, end, fields, output_format, page_size)
+
+    if output_format == "table":
+        header = f"# total={total} offset={offset} count={len(page)}"
+        footer = f"\n# next_cursor={next_cursor}" if next_cursor else ""
+        return f"{header}\n{_format_table(page)}{footer}"
+    return json.dumps(
+        {"total": total, "offset": offset, "records": page, "next_cursor": next_cursor},
+        ensure_ascii=False
+    )
+
+
+@mcp.tool()
+async def PubChem_search_compounds(
+    query: Optional[str] = None,
+    search_type: Literal['name', 'smiles', 'inchi', 'sdf', 'cid', 'formula'] = 'name',
+    max_records: int = 100,
+    fields: Optional[list[str]] = None,
+    output_format: Literal['raw', 'json', 'table'] = 'raw',
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None
+) -> str:
+    """
+    Search PubChem database for chemical compounds
+
+    Args:
+        query (str, optional): Search query (compound name, CAS, formula, or identifier) (cursor가 없으면 필수).
+        search_type (Literal['name', 'smiles', 'inchi', 'sdf', 'cid', 'formula'], optional): Type of search to perform (검색 유형). Defaults to 'name'.
+        max_records (int, optional): Maximum number of results (최대 결과 수, 기본값: 100).
+        fields (list[str], optional): Fields to keep per record, e.g. ["cid", "name", "formula", "weight", "smiles"] (반환할 필드).
+        output_format (Literal['raw', 'json', 'table'], optional): 'raw' returns the server text verbatim, 'table' a compact tab-separated table (출력 형식). Defaults to 'raw'.
+        page_size (int, optional): Number of records per page (페이지당 레코드 수).
+        cursor (str, optional): next_cursor from a previous page; query/search_type/max_records and the previous fields/output_format/page_size are taken from it. Explicitly passed fields, page_size or a non-raw output_format override the stored ones (다음 페이지 커서).
+
+    Returns:
+        str: contexts of PubChem compound records
+    """
+    offset = 0
+    if cursor:
+        try:
+            query, search_type, max_records, offset, cursor_fields, cursor_format, cursor_page_size = _decode_cursor(cursor)
+        except Exception:
+            return "Error: Invalid cursor."
+        # 명시적으로 준 인자가 있으면 그것을, 없으면 첫 페이지 요청의 값을 이어서 사용
+        fields = fields if fields is not None else cursor_fields
+        page_size = page_size if page_size is not None else cursor_page_size
+        if output_format == 'raw':
+            output_format = cursor_format
+    elif not query:
+        return "Error: query is required."
+
+    # 다음 페이지는 캐시에 있는 전체 결과에서 잘라내므로 재조회하지 않음
+    text = await _search_compounds(query, search_type, max_records)
+
+    if output_format == 'raw' and not fields and page_size is None and not cursor:
+        return text
+    return _shape_result(text, query, search_type, max_records, fields,
+                         'table' if output_format == 'table' else 'json', offset, page_size)
+
+
+@mcp.tool()
+async def PubChem_search_compounds_batch(
+    queries: list[str],
+    search_type: Literal['name', 'smiles', 'inchi', 'sdf', 'cid', 'formula'] = 'name',
+    max_records: int = 100,
+    fields: Optional[list[str]] = None,
+    output_format: Literal['raw', 'json', 'table'] = 'raw'
+) -> str:
+    """
+    Search PubChem database for multiple chemical compounds at once
+
+    Args:
+        queries (list[str]): Search queries (compound names, CAS, formulas, or identifiers) (필수, 여러 개).
+        search_type (Literal['name', 'smiles', 'inchi', 'sdf', 'cid', 'formula'], optional): Type of search to perform (검색 유형). Defaults to 'name'.
+        max_records (int, optional): Maximum number of results per query (쿼리당 최대 결과 수, 기본값: 100).
+        fields (list[str], optional): Fields to keep per record, e.g. ["cid", "name", "formula", "weight", "smiles"] (반환할 필드).
+        output_format (Literal['raw', 'json', 'table'], optional): Format of each item's result (결과 형식). Defaults to 'raw'.
+
+    Returns:
+        str: JSON array in input order; each item has "query" and either "result" or "error"
+    """
+    if not queries:
+        return "Error: The 'queries' list is required."
+    if len(queries) > PUBCHEM_BATCH_MAX_QUERIES:
+        return f"Error: Too many queries ({len(queries)}). Maximum is {PUBCHEM_BATCH_MAX_QUERIES}."
+
+    # 동시에 실행하되 업스트림 호출은 rate limiter와 세션 풀이 제한, 중복 쿼리는 하나로 합쳐짐
+    results = await asyncio.gather(
+        *(_search_compounds(q, search_type, max_records) for q in queries),
+        return_exceptions=True
+    )
+
+    items = []
+    for q, r in zip(queries, results):
+        if isinstance(r, BaseException):
+            items.append({"query": q, "error": f"Error executing Node.js tool: {type(r).__name__}: {str(r)}"})
+        elif r.startswith("Error"):
+            items.append({"query": q, "error": r})
+        elif output_format == 'raw' and not fields:
+            items.append({"query": q, "result": r})
+        else:
+            shaped = _shape_result(r, q, search_type, max_records, fields,
+                                   'table' if output_format == 'table' else 'json')
+            items.append({"query": q, "result": shaped})
+    return json.dumps(items, ensure_ascii=False)
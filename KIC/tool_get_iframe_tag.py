@@ -1,459 +1,966 @@
 # 차트생성을 위한 data format을 입력받아 html 파일을 생성하고, 이를 iframe tag를 통해 시각화할 수 있도록 돕는 도구입니다.
 
-@mcp.tool()
-async def generate_chart_html(data_json) -> str:
-    """
-    Chart.js를 사용하여 HTML 차트를 생성하고 업로드된 URL을 반환합니다.
-    
-    지원하는 차트 타입:
-    - 'bar', 'line', 'pie': 기본 차트 (타입 간 전환 버튼 포함)
-    - 'mixed': 여러 데이터셋을 가진 혼합 차트
-    - 'dual_axis': 이중 축 차트
+import json
+import os
+import time
+import uuid
+import base64
+import random
+import asyncio
+import hashlib
+import mimetypes
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib import parse
+from datetime import datetime, timezone
 
-    Args:
-        data_json (str | dict): 차트 데이터 JSON 문자열 또는 딕셔너리 객체
-            (입력 예시는 원본 독스트링 참조)
+import httpx
+import numpy as np
 
-    Returns:
-        str: 성공시 iframe HTML 태그, 실패시 에러 메시지
-    """
+# 동일 차트 재생성 시 재업로드를 피하기 위한 content hash → presigned URL 캐시 설정
+CHART_URL_CACHE_MAX_ENTRIES = int(os.getenv("CHART_URL_CACHE_MAX_ENTRIES", "512"))
+# presigned URL에서 만료 시각을 알 수 없을 때 사용할 유효 시간(초)
+CHART_URL_DEFAULT_TTL = float(os.getenv("CHART_URL_DEFAULT_TTL", "3600"))
+# 만료 직전 URL을 돌려주지 않도록 두는 여유 시간(초)
+CHART_URL_EXPIRY_MARGIN = float(os.getenv("CHART_URL_EXPIRY_MARGIN", "300"))
 
-    import json
-    import os
-    import uuid
-    import mimetypes
-    from urllib import request, parse, error # error 모듈 추가
-    from datetime import datetime
+# 차트 HTML 업로드 설정
+CHART_UPLOAD_URL = os.getenv("CHART_UPLOAD_URL", "http://llmops-cdn-api-service:8080/minio/upload/temp")
+CHART_UPLOAD_TIMEOUT = float(os.getenv("CHART_UPLOAD_TIMEOUT", "30"))
+CHART_UPLOAD_MAX_CONNECTIONS = int(os.getenv("CHART_UPLOAD_MAX_CONNECTIONS", "10"))
+CHART_UPLOAD_MAX_RETRIES = int(os.getenv("CHART_UPLOAD_MAX_RETRIES", "3"))
+CHART_UPLOAD_BACKOFF_BASE = float(os.getenv("CHART_UPLOAD_BACKOFF_BASE", "0.3"))
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
 
-    
-    HTML_TEMPLATE = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <meta charset="UTF-8">
-        <meta name="viewport" content="width=device-width, initial-scale=1.0">
-        <title>{title}</title>
-        <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
-        <style>
-            body {{
-                margin: 0;
-                padding: 20px;
-                font-family: Arial, sans-serif;
-                box-sizing: border-box;
-            }}
+_upload_client = None
+_upload_client_loop = None
+# 루프 교체로 버려진 클라이언트의 aclose 태스크 (GC로 사라지지 않도록 보관)
+_upload_client_close_tasks = set()
+
+# 파싱/해시/HTML 생성용 스레드 수 (CPU 작업이 GIL을 두고 이벤트 루프와 경쟁하지 않도록 작게 유지)
+CHART_RENDER_WORKERS = int(os.getenv("CHART_RENDER_WORKERS", "2"))
+_render_executor = ThreadPoolExecutor(max_workers=max(1, CHART_RENDER_WORKERS), thread_name_prefix="chart-render")
+
+# 대용량 시계열 다운샘플링 목표 포인트 수 (data_json의 'max_points'로 차트별 지정 가능, 0이면 비활성)
+CHART_MAX_POINTS = int(os.getenv("CHART_MAX_POINTS", "2000"))
+# 이 길이 이상의 숫자 배열은 JSON 리터럴 대신 base64 typed array로 인라인
+CHART_TYPED_ARRAY_MIN_LENGTH = int(os.getenv("CHART_TYPED_ARRAY_MIN_LENGTH", "256"))
+
+# 대시보드(여러 차트 단일 HTML) 설정
+DASHBOARD_MAX_CHARTS = int(os.getenv("DASHBOARD_MAX_CHARTS", "12"))
+DASHBOARD_ROW_HEIGHT = 460
+DASHBOARD_MAX_IFRAME_HEIGHT = 2400
+
+SUPPORTED_CHART_TYPES = ['bar', 'line', 'pie', 'mixed', 'dual_axis']
+
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    <style>
+        body {{
+            margin: 0;
+            padding: 20px;
+            font-family: Arial, sans-serif;
+            box-sizing: border-box;
+        }}
+        .chart-container {{
+            position: relative;
+            width: 100%;
+            height: 400px;
+            max-width: 100%;
+            overflow: hidden;
+        }}
+        .button-group {{
+            margin-bottom: 15px;
+        }}
+        .switch-btn {{
+            display: inline-block;
+            margin-right: 8px;
+            padding: 6px 16px;
+            font-size: 15px;
+            border: 1px solid #bbb;
+            border-radius: 2px;
+            background: #f5f5f5;
+            cursor: pointer;
+            color: #222;
+        }}
+        .switch-btn.active {{
+            background: #222;
+            color: #fff;
+        }}
+        h2 {{
+            margin: 0 0 20px 0;
+            font-size: 20px;
+        }}
+
+        @media (max-width: 768px) {{
             .chart-container {{
-                position: relative;
-                width: 100%;
-                height: 400px;
-                max-width: 100%;
-                overflow: hidden;
+                height: 300px;
             }}
-            .button-group {{
-                margin-bottom: 15px;
+            body {{
+                padding: 10px;
             }}
-            .switch-btn {{
-                display: inline-block;
-                margin-right: 8px;
-                padding: 6px 16px;
-                font-size: 15px;
-                border: 1px solid #bbb;
-                border-radius: 2px;
-                background: #f5f5f5;
-                cursor: pointer;
-                color: #222;
+        }}
+    </style>
+</head>
+<body>
+    <h2>{title}</h2>
+    {button_html}
+    <div class="chart-container">
+        <canvas id="myChart"></canvas>
+    </div>
+    <script>
+    {decode_js}
+    {chart_js}
+    </script>
+</body>
+</html>
+"""
+
+
+DASHBOARD_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <script src="https://cdn.jsdelivr.net/npm/chart.js"></script>
+    <style>
+        body {{
+            margin: 0;
+            padding: 20px;
+            font-family: Arial, sans-serif;
+            box-sizing: border-box;
+        }}
+        .dashboard {{
+            display: grid;
+            grid-template-columns: repeat(auto-fit, minmax(480px, 1fr));
+            gap: 20px;
+        }}
+        .chart-card {{
+            min-width: 0;
+            border: 1px solid #e5e5e5;
+            border-radius: 4px;
+            padding: 12px;
+        }}
+        .chart-container {{
+            position: relative;
+            width: 100%;
+            height: 360px;
+            max-width: 100%;
+            overflow: hidden;
+        }}
+        .button-group {{
+            margin-bottom: 10px;
+        }}
+        .switch-btn {{
+            display: inline-block;
+            margin-right: 8px;
+            padding: 4px 12px;
+            font-size: 14px;
+            border: 1px solid #bbb;
+            border-radius: 2px;
+            background: #f5f5f5;
+            cursor: pointer;
+            color: #222;
+        }}
+        .switch-btn.active {{
+            background: #222;
+            color: #fff;
+        }}
+        h2 {{
+            margin: 0 0 20px 0;
+            font-size: 20px;
+        }}
+        h3 {{
+            margin: 0 0 10px 0;
+            font-size: 16px;
+        }}
+
+        @media (max-width: 768px) {{
+            .dashboard {{
+                grid-template-columns: 1fr;
             }}
-            .switch-btn.active {{
-                background: #222;
-                color: #fff;
+            .chart-container {{
+                height: 300px;
             }}
-            h2 {{
-                margin: 0 0 20px 0;
-                font-size: 20px;
+            body {{
+                padding: 10px;
             }}
-            
-            @media (max-width: 768px) {{
-                .chart-container {{
-                    height: 300px;
-                }}
-                body {{
-                    padding: 10px;
+        }}
+    </style>
+</head>
+<body>
+    <h2>{title}</h2>
+    <div class="dashboard">
+    {cards}
+    </div>
+    <script>
+    {decode_js}
+    const chartRenderers = {{}};
+    const chartSwitchers = {{}};
+    {renderers_js}
+
+    // 화면에 들어온 차트만 그린다 (IntersectionObserver 미지원 시 전부 즉시 렌더)
+    function renderOnce(id) {{
+        const render = chartRenderers[id];
+        if (!render) return;
+        delete chartRenderers[id];
+        render();
+    }}
+    window.addEventListener('load', function() {{
+        const canvases = document.querySelectorAll('.chart-container canvas');
+        if (!('IntersectionObserver' in window)) {{
+            canvases.forEach(c => renderOnce(c.id));
+            return;
+        }}
+        const observer = new IntersectionObserver(function(entries) {{
+            entries.forEach(entry => {{
+                if (entry.isIntersecting) {{
+                    observer.unobserve(entry.target);
+                    renderOnce(entry.target.id);
                 }}
-            }}
-        </style>
-    </head>
-    <body>
-        <h2>{title}</h2>
+            }});
+        }}, {{ rootMargin: '200px' }});
+        canvases.forEach(c => observer.observe(c));
+    }});
+    </script>
+</body>
+</html>
+"""
+
+DASHBOARD_CARD_TEMPLATE = """
+    <div class="chart-card">
+        <h3>{title}</h3>
         {button_html}
         <div class="chart-container">
-            <canvas id="myChart"></canvas>
+            <canvas id="{canvas_id}"></canvas>
         </div>
-        <script>
-        {chart_js}
-        </script>
-    </body>
-    </html>
+    </div>"""
+
+
+def gen_unique_filename(prefix="chart", ext="html"):
+    ts = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    uid = str(uuid.uuid4())[:8]
+    return f"{prefix}_{ts}_{uid}.{ext}"
+
+
+# base64로 인라인된 typed array를 브라우저에서 일반 배열로 복원
+DECODE_TYPED_ARRAY_JS = """
+function decodeTyped(b64, type) {
+    const bin = atob(b64);
+    const bytes = new Uint8Array(bin.length);
+    for (let i = 0; i < bin.length; i++) bytes[i] = bin.charCodeAt(i);
+    const T = {i32: Int32Array, f32: Float32Array, f64: Float64Array}[type];
+    return Array.from(new T(bytes.buffer));
+}
+"""
+
+
+def _to_numeric_array(values):
+    """숫자(또는 None) 리스트면 float64 배열, 그 외(객체/문자열 등)는 None"""
+    if not isinstance(values, (list, tuple)):
+        return None
+    try:
+        arr = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+    return arr if arr.ndim == 1 else None
+
+
+def lttb_indices(y, n_out):
     """
+    Largest-Triangle-Three-Buckets로 선택할 인덱스 반환 (x는 등간격 인덱스로 간주).
+    첫/마지막 점은 항상 포함되며, 각 버킷에서 직전 선택점·다음 버킷 평균과 만드는 삼각형 면적이 최대인 점을 고른다.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
 
-    def gen_unique_filename(prefix="chart", ext="html"):
-        ts = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
-        uid = str(uuid.uuid4())[:8]
-        return f"{prefix}_{ts}_{uid}.{ext}"
-
-    def _get_compatible_chart_js(data):
-        x_values = data['x_values']
-        y_values = data['y_values']
-        y_label = data.get('y_label', '')
-        title = data.get('title', '')
-        cur_type = data['chart_type']
-        js = f"""
-    let chartType = '{cur_type}';
-    let chart;
-    const xValues = {json.dumps(x_values)};
-    const yValues = {json.dumps(y_values)};
-    const chartTitle = {json.dumps(title)};
-    const yLabel = {json.dumps(y_label)};
-
-    function getDataset(type) {{
-        if(type === 'bar') {{
-            return [{{
-                label: yLabel,
-                data: yValues,
-                backgroundColor: 'rgba(54,162,235,0.6)'
-            }}];
-        }}
-        if(type === 'line') {{
-            return [{{
-                label: yLabel,
-                data: yValues,
-                borderColor: 'rgba(255,99,132,0.8)',
-                backgroundColor: 'rgba(255,99,132,0.35)',
-                fill: false,
-                tension: 0.2
-            }}];
-        }}
-        if(type === 'pie') {{
-            return [{{
-                label: yLabel,
-                data: yValues,
-                backgroundColor: [
-                    'rgba(255, 99, 132, 0.6)', 'rgba(54, 162, 235, 0.6)',
-                    'rgba(255, 206, 86, 0.6)', 'rgba(75, 192, 192, 0.6)',
-                    'rgba(153, 102, 255, 0.6)', 'rgba(255, 159, 64, 0.6)'
-                ]
-            }}];
-        }}
-    }}
+    y = np.where(np.isnan(y), 0.0, y)
+    x = np.arange(n, dtype=np.float64)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
 
-    function getConfig(type) {{
-        let config = {{
-            type: type,
-            data: {{
-                labels: xValues,
-                datasets: getDataset(type),
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: false,
-                plugins: {{
-                    legend: {{
-                        display: type==='pie'
-                    }}
-                }},
-                scales: (type === 'bar' || type === 'line') ? {{
-                    x: {{ 
-                        title: {{ display: false }},
-                        grid: {{ display: true }}
-                    }},
-                    y: {{ 
-                        title: {{ display: true, text: yLabel }},
-                        grid: {{ display: true }}
-                    }}
-                }} : {{}}
-            }}
-        }};
-        return config;
-    }}
+    # 다음 버킷 평균은 선택 결과와 무관하므로 누적합으로 한 번에 계산
+    csum = np.concatenate(([0.0], np.cumsum(y)))
+    next_start = edges[1:]
+    next_end = np.append(edges[2:], n)
+    avg_x = (next_start + next_end - 1) / 2.0
+    avg_y = (csum[next_end] - csum[next_start]) / np.maximum(next_end - next_start, 1)
 
-    function renderChart(type) {{
-        let ctx = document.getElementById('myChart').getContext('2d');
-        if(chart) chart.destroy();
-        chart = new Chart(ctx, getConfig(type));
-    }}
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        area = np.abs((x[a] - avg_x[i]) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y[i] - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def downsample_chart_data(data):
+    """line/bar/mixed/dual_axis 차트의 포인트 수가 max_points를 넘으면 LTTB로 줄인 사본 반환"""
+    max_points = data.get('max_points', CHART_MAX_POINTS)
+    x_values = data.get('x_values')
+    if not max_points or data['chart_type'] == 'pie' or not isinstance(x_values, list) or len(x_values) <= max_points:
+        return data
+
+    if data['chart_type'] in ['bar', 'line']:
+        series = [data['y_values']]
+    else:
+        series = [ds.get('data') for ds in data['datasets']]
+    arrays = [_to_numeric_array(v) for v in series]
+    if any(arr is None or len(arr) != len(x_values) for arr in arrays):
+        return data
+
+    # 여러 시리즈는 각자 고른 인덱스의 합집합을 사용해 라벨 정렬을 유지
+    per_series = max(3, max_points // len(arrays))
+    indices = np.unique(np.concatenate([lttb_indices(arr, per_series) for arr in arrays]))
+
+    out = dict(data)
+    out['x_values'] = [x_values[i] for i in indices]
+    if data['chart_type'] in ['bar', 'line']:
+        out['y_values'] = arrays[0][indices]
+    else:
+        out['datasets'] = [dict(ds, data=arr[indices]) for ds, arr in zip(data['datasets'], arrays)]
+    return out
+
+
+def _js_array(values):
+    """숫자 배열은 가장 작은 무손실 typed array(base64)로, 그 외는 JSON 리터럴로 변환"""
+    arr = values if isinstance(values, np.ndarray) else _to_numeric_array(values)
+    if arr is None or len(arr) < CHART_TYPED_ARRAY_MIN_LENGTH:
+        if isinstance(values, np.ndarray):
+            values = [None if np.isnan(v) else v.item() for v in values]
+        return json.dumps(values)
+
+    finite = arr[~np.isnan(arr)]
+    if len(finite) == len(arr) and np.all(finite == np.round(finite)) and np.all(np.abs(finite) < 2 ** 31):
+        encoded, kind = arr.astype('<i4'), 'i32'
+    elif np.array_equal(arr.astype(np.float32).astype(np.float64), arr, equal_nan=True):
+        encoded, kind = arr.astype('<f4'), 'f32'
+    else:
+        encoded, kind = arr.astype('<f8'), 'f64'
+    b64 = base64.b64encode(encoded.tobytes()).decode('ascii')
+    return f'decodeTyped("{b64}", "{kind}")'
 
-    function switchChartType(type) {{
-        chartType = type;
-        renderChart(type);
-        // 버튼 스타일 변경
-        let btns = document.querySelectorAll('.switch-btn');
-        btns.forEach(btn => {{
-            if(btn.textContent.toLowerCase() === type) btn.classList.add('active');
-            else btn.classList.remove('active');
-        }});
+
+def _js_datasets(datasets):
+    """dataset 객체 배열을 JS 리터럴로 변환 (각 data 배열은 _js_array로 압축)"""
+    items = []
+    for ds in datasets:
+        rest = {k: v for k, v in ds.items() if k != 'data'}
+        body = json.dumps(rest)[1:-1]
+        if 'data' in ds:
+            body += (', ' if body else '') + f'"data": {_js_array(ds["data"])}'
+        items.append('{' + body + '}')
+    return '[' + ', '.join(items) + ']'
+
+
+def _get_compatible_chart_js(data, canvas_id='myChart', standalone=True):
+    x_values = data['x_values']
+    y_values = data['y_values']
+    y_label = data.get('y_label', '')
+    title = data.get('title', '')
+    cur_type = data['chart_type']
+    if standalone:
+        init_js = "window.onload = function() {\n    renderChart(chartType);\n};"
+    else:
+        # 대시보드: 감싸는 렌더 함수가 호출될 때 바로 그리고, 버튼이 찾을 수 있도록 전환 함수 등록
+        init_js = f"renderChart(chartType);\nchartSwitchers[{json.dumps(canvas_id)}] = switchChartType;"
+    js = f"""
+let chartType = '{cur_type}';
+let chart;
+const xValues = {json.dumps(x_values)};
+const yValues = {_js_array(y_values)};
+const chartTitle = {json.dumps(title)};
+const yLabel = {json.dumps(y_label)};
+
+function getDataset(type) {{
+    if(type === 'bar') {{
+        return [{{
+            label: yLabel,
+            data: yValues,
+            backgroundColor: 'rgba(54,162,235,0.6)'
+        }}];
     }}
+    if(type === 'line') {{
+        return [{{
+            label: yLabel,
+            data: yValues,
+            borderColor: 'rgba(255,99,132,0.8)',
+            backgroundColor: 'rgba(255,99,132,0.35)',
+            fill: false,
+            tension: 0.2
+        }}];
+    }}
+    if(type === 'pie') {{
+        return [{{
+            label: yLabel,
+            data: yValues,
+            backgroundColor: [
+                'rgba(255, 99, 132, 0.6)', 'rgba(54, 162, 235, 0.6)',
+                'rgba(255, 206, 86, 0.6)', 'rgba(75, 192, 192, 0.6)',
+                'rgba(153, 102, 255, 0.6)', 'rgba(255, 159, 64, 0.6)'
+            ]
+        }}];
+    }}
+}}
 
-    window.onload = function() {{
-        renderChart(chartType);
-    }};
-    """
-        return js
-
-    def _get_mixed_chart_js(data):
-        x_values = data['x_values']
-        title = data.get('title', '')
-        datasets = data['datasets']
-        y_label = data.get('y_label', '값')
-        colors = [
-            'rgba(54,162,235,0.6)',
-            'rgba(255,99,132,0.6)',
-            'rgba(255,206,86,0.6)',
-            'rgba(75,192,192,0.6)',
-            'rgba(153,102,255,0.6)'
-        ]
-        js_datasets = []
-        for idx, ds in enumerate(datasets):
-            obj = dict(ds)
-            obj['backgroundColor'] = colors[idx % len(colors)]
-            obj['borderColor'] = colors[idx % len(colors)]
-            if ds.get('type') == 'line':
-                obj['fill'] = False
-                obj['tension'] = 0.2
-            if 'yAxisID' not in obj:
-                obj['yAxisID'] = 'y'
-            js_datasets.append(obj)
-        
-        js = f"""
-    let xValues = {json.dumps(x_values)};
-    let chartTitle = {json.dumps(title)};
-    let datasets = {json.dumps(js_datasets)};
-    let yLabel = {json.dumps(y_label)};
-    let ctx = document.getElementById('myChart').getContext('2d');
-    let chart = new Chart(ctx, {{
-        type: 'bar',  // 기본 타입, 각 dataset의 type으로 오버라이드됨
+function getConfig(type) {{
+    let config = {{
+        type: type,
         data: {{
             labels: xValues,
-            datasets: datasets,
+            datasets: getDataset(type),
         }},
         options: {{
             responsive: true,
             maintainAspectRatio: false,
             plugins: {{
                 legend: {{
-                    display: true
+                    display: type==='pie'
                 }}
             }},
-            scales: {{
+            scales: (type === 'bar' || type === 'line') ? {{
                 x: {{ 
                     title: {{ display: false }},
                     grid: {{ display: true }}
                 }},
-                y: {{
+                y: {{ 
                     title: {{ display: true, text: yLabel }},
-                    beginAtZero: true,
                     grid: {{ display: true }}
                 }}
-            }}
+            }} : {{}}
         }}
+    }};
+    return config;
+}}
+
+function renderChart(type) {{
+    let ctx = document.getElementById({json.dumps(canvas_id)}).getContext('2d');
+    if(chart) chart.destroy();
+    chart = new Chart(ctx, getConfig(type));
+}}
+
+function switchChartType(type) {{
+    chartType = type;
+    renderChart(type);
+    // 버튼 스타일 변경
+    let btns = document.querySelectorAll({json.dumps('#' + canvas_id + '-buttons .switch-btn')});
+    btns.forEach(btn => {{
+        if(btn.textContent.toLowerCase() === type) btn.classList.add('active');
+        else btn.classList.remove('active');
     }});
-    """
-        return js
-
-    def _get_dual_axis_chart_js(data):
-        x_values = data['x_values']
-        title = data.get('title', '')
-        datasets = data['datasets']
-        y_axes = data['y_axes']
-        colors = [
-            'rgba(54,162,235,0.6)',
-            'rgba(255,99,132,0.6)',
-            'rgba(255,206,86,0.6)',
-            'rgba(75,192,192,0.6)',
-            'rgba(153,102,255,0.6)'
-        ]
-        js_datasets = []
-        for idx, ds in enumerate(datasets):
-            obj = dict(ds)
-            obj['backgroundColor'] = colors[idx % len(colors)]
-            obj['borderColor'] = colors[idx % len(colors)]
-            if ds.get('type') == 'line':
-                obj['fill'] = False
-                obj['tension'] = 0.2
-            js_datasets.append(obj)
-        
-        js_y_axes = {}
-        for y in y_axes:
-            js_y_axes[y['id']] = {
-                'type': 'linear',
-                'position': 'left' if y['id']=='y1' else 'right',
-                'title': {'display': True, 'text': y['label']},
-                'beginAtZero': True,
-                'grid': {'drawOnChartArea': y['id']=='y1'}
-            }
-        js = f"""
-    let xValues = {json.dumps(x_values)};
-    let chartTitle = {json.dumps(title)};
-    let datasets = {json.dumps(js_datasets)};
-    let ctx = document.getElementById('myChart').getContext('2d');
-    let chart = new Chart(ctx, {{
-        type: 'bar',  // 기본 타입, 각 dataset의 type으로 오버라이드됨
-        data: {{
-            labels: xValues,
-            datasets: datasets,
+}}
+
+{init_js}
+"""
+    return js
+
+
+def _get_mixed_chart_js(data, canvas_id='myChart'):
+    x_values = data['x_values']
+    title = data.get('title', '')
+    datasets = data['datasets']
+    y_label = data.get('y_label', '값')
+    colors = [
+        'rgba(54,162,235,0.6)',
+        'rgba(255,99,132,0.6)',
+        'rgba(255,206,86,0.6)',
+        'rgba(75,192,192,0.6)',
+        'rgba(153,102,255,0.6)'
+    ]
+    js_datasets = []
+    for idx, ds in enumerate(datasets):
+        obj = dict(ds)
+        obj['backgroundColor'] = colors[idx % len(colors)]
+        obj['borderColor'] = colors[idx % len(colors)]
+        if ds.get('type') == 'line':
+            obj['fill'] = False
+            obj['tension'] = 0.2
+        if 'yAxisID' not in obj:
+            obj['yAxisID'] = 'y'
+        js_datasets.append(obj)
+
+    js = f"""
+let xValues = {json.dumps(x_values)};
+let chartTitle = {json.dumps(title)};
+let datasets = {_js_datasets(js_datasets)};
+let yLabel = {json.dumps(y_label)};
+let ctx = document.getElementById({json.dumps(canvas_id)}).getContext('2d');
+let chart = new Chart(ctx, {{
+    type: 'bar',  // 기본 타입, 각 dataset의 type으로 오버라이드됨
+    data: {{
+        labels: xValues,
+        datasets: datasets,
+    }},
+    options: {{
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {{
+            legend: {{
+                display: true
+            }}
         }},
-        options: {{
-            responsive: true,
-            maintainAspectRatio: false,
-            plugins: {{
-                legend: {{
-                    display: true
-                }}
+        scales: {{
+            x: {{ 
+                title: {{ display: false }},
+                grid: {{ display: true }}
             }},
-            scales: {json.dumps(js_y_axes)}
+            y: {{
+                title: {{ display: true, text: yLabel }},
+                beginAtZero: true,
+                grid: {{ display: true }}
+            }}
         }}
-    }});
-    """
-        return js
-
-    def generate_chart_html(data):
-        chart_type = data['chart_type']
-        title = data.get('title', '')
-
-        group1 = ['bar', 'line', 'pie']
-
-        if chart_type in group1:
-            cur_type = chart_type
-            button_html = '<div class="button-group">'
-            for ct in group1:
-                cls = 'switch-btn' + (' active' if ct == cur_type else '')
-                button_html += f'<button class="{cls}" onclick="switchChartType(\'{ct}\')">{ct.capitalize()}</button>'
-            button_html += '</div>'
-            chart_js = _get_compatible_chart_js(data)
-        elif chart_type == 'mixed':
-            button_html = ''
-            chart_js = _get_mixed_chart_js(data)
-        elif chart_type == 'dual_axis':
-            button_html = ''
-            chart_js = _get_dual_axis_chart_js(data)
-        else:
-            raise ValueError(f"Unknown chart_type: {chart_type}")
-
-        html = HTML_TEMPLATE.format(title=title, button_html=button_html, chart_js=chart_js)
-        return html
-
-    def upload_to_temp_and_get_url(file_path):
-        url = "http://llmops-cdn-api-service:8080/minio/upload/temp"
-        boundary = '----WebKitFormBoundary' + uuid.uuid4().hex
-        CRLF = '\r\n'
-
-        # 파일명 및 데이터 읽기
-        filename = os.path.basename(file_path)
-        with open(file_path, 'rb') as f:
-            file_data = f.read()
-        
-        # hostname 로직 적용 (요청하신 부분)
-        hostname = os.getenv("G__CLUSTER_HOSTNAME", "")
-        hostname = hostname.replace("genos.mnc", "genos.genon") 
-        
-        hostname_field = (
-            f'--{boundary}{CRLF}'
-            f'Content-Disposition: form-data; name="hostname"{CRLF}{CRLF}'
-            f'{hostname}{CRLF}'
-        )
-
-        # 파일 필드
-        content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
-        file_field = (
-            f'--{boundary}{CRLF}'
-            f'Content-Disposition: form-data; name="file"; filename="{filename}"{CRLF}'
-            f'Content-Type: {content_type}{CRLF}{CRLF}'
-        ).encode('utf-8') + file_data + CRLF.encode('utf-8')
+    }}
+}});
+"""
+    return js
 
-        # 끝 표시
-        end_boundary = f'--{boundary}--{CRLF}'.encode('utf-8')
 
-        # 바이트 결합
-        body = hostname_field.encode('utf-8') + file_field + end_boundary
+def _get_dual_axis_chart_js(data, canvas_id='myChart'):
+    x_values = data['x_values']
+    title = data.get('title', '')
+    datasets = data['datasets']
+    y_axes = data['y_axes']
+    colors = [
+        'rgba(54,162,235,0.6)',
+        'rgba(255,99,132,0.6)',
+        'rgba(255,206,86,0.6)',
+        'rgba(75,192,192,0.6)',
+        'rgba(153,102,255,0.6)'
+    ]
+    js_datasets = []
+    for idx, ds in enumerate(datasets):
+        obj = dict(ds)
+        obj['backgroundColor'] = colors[idx % len(colors)]
+        obj['borderColor'] = colors[idx % len(colors)]
+        if ds.get('type') == 'line':
+            obj['fill'] = False
+            obj['tension'] = 0.2
+        js_datasets.append(obj)
 
-        # 요청 헤더
-        headers = {
-            'Content-Type': f'multipart/form-data; boundary={boundary}',
-            'Content-Length': str(len(body))
+    js_y_axes = {}
+    for y in y_axes:
+        js_y_axes[y['id']] = {
+            'type': 'linear',
+            'position': 'left' if y['id']=='y1' else 'right',
+            'title': {'display': True, 'text': y['label']},
+            'beginAtZero': True,
+            'grid': {'drawOnChartArea': y['id']=='y1'}
         }
+    js = f"""
+let xValues = {json.dumps(x_values)};
+let chartTitle = {json.dumps(title)};
+let datasets = {_js_datasets(js_datasets)};
+let ctx = document.getElementById({json.dumps(canvas_id)}).getContext('2d');
+let chart = new Chart(ctx, {{
+    type: 'bar',  // 기본 타입, 각 dataset의 type으로 오버라이드됨
+    data: {{
+        labels: xValues,
+        datasets: datasets,
+    }},
+    options: {{
+        responsive: true,
+        maintainAspectRatio: false,
+        plugins: {{
+            legend: {{
+                display: true
+            }}
+        }},
+        scales: {json.dumps(js_y_axes)}
+    }}
+}});
+"""
+    return js
+
+
+def _build_chart_parts(data, canvas_id='myChart', switch_fn='switchChartType', standalone=True):
+    """차트 1개의 (전환 버튼 HTML, 차트 JS) 생성"""
+    data = downsample_chart_data(data)
+    chart_type = data['chart_type']
+
+    group1 = ['bar', 'line', 'pie']
+
+    if chart_type in group1:
+        cur_type = chart_type
+        button_html = f'<div class="button-group" id="{canvas_id}-buttons">'
+        for ct in group1:
+            cls = 'switch-btn' + (' active' if ct == cur_type else '')
+            button_html += f'<button class="{cls}" onclick="{switch_fn}(\'{ct}\')">{ct.capitalize()}</button>'
+        button_html += '</div>'
+        chart_js = _get_compatible_chart_js(data, canvas_id, standalone)
+    elif chart_type == 'mixed':
+        button_html = ''
+        chart_js = _get_mixed_chart_js(data, canvas_id)
+    elif chart_type == 'dual_axis':
+        button_html = ''
+        chart_js = _get_dual_axis_chart_js(data, canvas_id)
+    else:
+        raise ValueError(f"Unknown chart_type: {chart_type}")
+    return button_html, chart_js
+
 
-        req = request.Request(url, data=body, headers=headers, method='POST')
+def render_chart_html(data):
+    title = data.get('title', '')
+    button_html, chart_js = _build_chart_parts(data)
+    html = HTML_TEMPLATE.format(title=title, button_html=button_html,
+                                decode_js=DECODE_TYPED_ARRAY_JS, chart_js=chart_js)
+    return html
 
-        with request.urlopen(req) as resp:
-            resp_body = resp.read()
-            resp_json = json.loads(resp_body)
-            return resp_json['data']['presigned_url']
 
+def render_dashboard_html(charts, title=''):
+    """여러 차트를 Chart.js 1회 로드 + 그리드 레이아웃의 단일 HTML로 생성 (각 차트는 화면에 보일 때 렌더)"""
+    cards = []
+    renderers = []
+    for idx, data in enumerate(charts):
+        canvas_id = f'chart-{idx}'
+        key = json.dumps(canvas_id)
+        button_html, chart_js = _build_chart_parts(
+            data, canvas_id, switch_fn=f"chartSwitchers['{canvas_id}']", standalone=False
+        )
+        cards.append(DASHBOARD_CARD_TEMPLATE.format(
+            title=data.get('title', ''), button_html=button_html, canvas_id=canvas_id
+        ))
+        # 차트별 변수가 서로 겹치지 않도록 함수 스코프로 감싼다
+        renderers.append(f"chartRenderers[{key}] = function() {{\n{chart_js}\n}};")
+
+    return DASHBOARD_TEMPLATE.format(
+        title=title, cards='\n'.join(cards),
+        decode_js=DECODE_TYPED_ARRAY_JS, renderers_js='\n'.join(renderers)
+    )
+
+
+def _get_upload_client():
+    """keep-alive 커넥션을 재사용하는 AsyncClient (이벤트 루프별로 1개)"""
+    global _upload_client, _upload_client_loop
+    loop = asyncio.get_running_loop()
+    if _upload_client is None or _upload_client.is_closed or _upload_client_loop is not loop:
+        if _upload_client is not None and not _upload_client.is_closed:
+            # 이전 루프의 클라이언트는 커넥션 풀을 정리하고 버림
+            task = loop.create_task(_close_quietly(_upload_client))
+            _upload_client_close_tasks.add(task)
+            task.add_done_callback(_upload_client_close_tasks.discard)
+        _upload_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(CHART_UPLOAD_TIMEOUT),
+            limits=httpx.Limits(max_connections=CHART_UPLOAD_MAX_CONNECTIONS,
+                                max_keepalive_connections=CHART_UPLOAD_MAX_CONNECTIONS),
+        )
+        _upload_client_loop = loop
+    return _upload_client
+
+
+async def _close_quietly(client):
     try:
-        # 1. JSON 파싱 및 데이터 검증
-        if isinstance(data_json, dict):
-            data = data_json
-        elif isinstance(data_json, str):
-            try:
-                data = json.loads(data_json)
-            except json.JSONDecodeError as e:
-                return f"ERROR: JSON 파싱 실패 - {str(e)}"
+        await client.aclose()
+    except Exception:
+        # 이미 닫힌 루프에 묶인 소켓은 정리 중 오류가 날 수 있음
+        pass
+
+
+async def close_upload_client():
+    """업로드 클라이언트의 keep-alive 커넥션을 닫음 (호스트 종료 시 await)"""
+    global _upload_client, _upload_client_loop
+    client, _upload_client, _upload_client_loop = _upload_client, None, None
+    if client is not None and not client.is_closed:
+        await _close_quietly(client)
+
+
+async def upload_to_temp_and_get_url(html, filename):
+    """메모리의 HTML을 multipart 스트림으로 업로드하고 presigned URL 반환 (일시 오류는 백오프 후 재시도)"""
+    # hostname 로직 적용 (요청하신 부분)
+    hostname = os.getenv("G__CLUSTER_HOSTNAME", "")
+    hostname = hostname.replace("genos.mnc", "genos.genon")
+
+    content_type = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    file_data = html.encode('utf-8')
+
+    client = _get_upload_client()
+    for attempt in range(CHART_UPLOAD_MAX_RETRIES + 1):
+        last_attempt = attempt >= CHART_UPLOAD_MAX_RETRIES
+        try:
+            resp = await client.post(
+                CHART_UPLOAD_URL,
+                data={'hostname': hostname},
+                files={'file': (filename, file_data, content_type)},
+            )
+        except httpx.TransportError:
+            if last_attempt:
+                raise
+        else:
+            if resp.status_code not in RETRYABLE_STATUS_CODES or last_attempt:
+                resp.raise_for_status()
+                return resp.json()['data']['presigned_url']
+        delay = CHART_UPLOAD_BACKOFF_BASE * (2 ** attempt)
+        await asyncio.sleep(delay + random.uniform(0, delay))
+
+
+def validate_chart_data(data):
+    """차트 데이터 검증. 문제가 있으면 에러 메시지, 없으면 None 반환"""
+    # 필수 필드 검증
+    if 'chart_type' not in data:
+        return "ERROR: 'chart_type' 필드가 누락되었습니다."
+
+    chart_type = data['chart_type']
+    if chart_type not in SUPPORTED_CHART_TYPES:
+        return f"ERROR: 지원하지 않는 chart_type '{chart_type}'. 지원 타입: {SUPPORTED_CHART_TYPES}"
+
+    # 기본 차트 타입 검증
+    if chart_type in ['bar', 'line', 'pie']:
+        if 'x_values' not in data or 'y_values' not in data:
+            return "ERROR: 기본 차트에는 'x_values'와 'y_values' 필드가 필요합니다."
+        if len(data['x_values']) != len(data['y_values']):
+            return "ERROR: x_values와 y_values의 길이가 일치하지 않습니다."
+
+    # 혼합/이중축 차트 검증
+    elif chart_type in ['mixed', 'dual_axis']:
+        if 'x_values' not in data or 'datasets' not in data:
+            return "ERROR: 혼합/이중축 차트에는 'x_values'와 'datasets' 필드가 필요합니다."
+        if not data['datasets']:
+            return "ERROR: datasets가 비어있습니다."
+        if chart_type == 'dual_axis' and 'y_axes' not in data:
+            return "ERROR: 이중축 차트에는 'y_axes' 필드가 필요합니다."
+    return None
+
+
+def _hash_update(h, value):
+    """정규화 직렬화를 해시에 누적. 긴 숫자 배열은 float64 바이트로 넣어 json.dumps(GIL을 계속 잡음)를 피함"""
+    if isinstance(value, dict):
+        h.update(b'{')
+        for key in sorted(value, key=str):
+            h.update(json.dumps(str(key), ensure_ascii=False).encode('utf-8') + b':')
+            _hash_update(h, value[key])
+        h.update(b'}')
+    elif isinstance(value, (list, tuple)):
+        arr = _to_numeric_array(value) if len(value) >= CHART_TYPED_ARRAY_MIN_LENGTH else None
+        if arr is not None:
+            h.update(b'#f64:%d:' % len(arr))
+            h.update(arr.tobytes())
+        elif any(isinstance(v, (dict, list, tuple)) for v in value):
+            h.update(b'[')
+            for v in value:
+                _hash_update(h, v)
+                h.update(b',')
+            h.update(b']')
         else:
-            return f"ERROR: 지원하지 않는 입력 타입 '{type(data_json)}'. str 또는 dict 타입이어야 합니다."
-        
-        # 필수 필드 검증
-        if 'chart_type' not in data:
-            return "ERROR: 'chart_type' 필드가 누락되었습니다."
-        
-        chart_type = data['chart_type']
-        supported_types = ['bar', 'line', 'pie', 'mixed', 'dual_axis']
-        if chart_type not in supported_types:
-            return f"ERROR: 지원하지 않는 chart_type '{chart_type}'. 지원 타입: {supported_types}"
-        
-        # 기본 차트 타입 검증
-        if chart_type in ['bar', 'line', 'pie']:
-            if 'x_values' not in data or 'y_values' not in data:
-                return "ERROR: 기본 차트에는 'x_values'와 'y_values' 필드가 필요합니다."
-            if len(data['x_values']) != len(data['y_values']):
-                return "ERROR: x_values와 y_values의 길이가 일치하지 않습니다."
-        
-        # 혼합/이중축 차트 검증
-        elif chart_type in ['mixed', 'dual_axis']:
-            if 'x_values' not in data or 'datasets' not in data:
-                return "ERROR: 혼합/이중축 차트에는 'x_values'와 'datasets' 필드가 필요합니다."
-            if not data['datasets']:
-                return "ERROR: datasets가 비어있습니다."
-            if chart_type == 'dual_axis' and 'y_axes' not in data:
-                return "ERROR: 이중축 차트에는 'y_axes' 필드가 필요합니다."
-
-        # 2. HTML 생성
+            h.update(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    else:
+        h.update(json.dumps(value, ensure_ascii=False).encode('utf-8'))
+
+
+def chart_content_hash(data):
+    """키 순서/공백과 무관하게 같은 차트 데이터면 같은 해시가 나오도록 정규화 후 sha256"""
+    h = hashlib.sha256()
+    _hash_update(h, data)
+    return h.hexdigest()
+
+
+def _presigned_url_expiry(url):
+    """presigned URL의 X-Amz-Date + X-Amz-Expires로 만료 시각(epoch) 계산, 없으면 기본 TTL 적용"""
+    params = parse.parse_qs(parse.urlsplit(url).query)
+    try:
+        signed_at = datetime.strptime(params['X-Amz-Date'][0], '%Y%m%dT%H%M%SZ').replace(tzinfo=timezone.utc)
+        return signed_at.timestamp() + int(params['X-Amz-Expires'][0])
+    except (KeyError, IndexError, ValueError):
+        return time.time() + CHART_URL_DEFAULT_TTL
+
+
+class ChartUrlCache:
+    """content hash → (presigned URL, 만료 시각) LRU 캐시"""
+
+    def __init__(self, max_entries=CHART_URL_CACHE_MAX_ENTRIES):
+        self.max_entries = max(1, max_entries)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest):
+        entry = self._entries.get(digest)
+        if entry is not None:
+            url, expires_at = entry
+            if expires_at - CHART_URL_EXPIRY_MARGIN > time.time():
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return url
+            del self._entries[digest]
+        self.misses += 1
+        return None
+
+    def set(self, digest, url):
+        self._entries[digest] = (url, _presigned_url_expiry(url))
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def stats(self):
+        return {'size': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+chart_url_cache = ChartUrlCache()
+
+
+def _to_iframe(url, height=500):
+    # iframe 태그로 감싸서 반환 (크기 조정)
+    return f'<iframe src="{url}" style="width:100%;height:{height}px;border:none;"></iframe>'
+
+
+def _parse_json_input(data_json, expected_types):
+    """str/dict/list 입력을 파싱. (데이터, 에러 메시지) 반환"""
+    if isinstance(data_json, expected_types):
+        return data_json, None
+    if isinstance(data_json, str):
         try:
-            html = generate_chart_html(data)
-        except Exception as e:
-            return f"ERROR: HTML 생성 실패 - {str(e)}"
+            data = json.loads(data_json)
+        except json.JSONDecodeError as e:
+            return None, f"ERROR: JSON 파싱 실패 - {str(e)}"
+        if not isinstance(data, expected_types):
+            return None, f"ERROR: 지원하지 않는 JSON 형식 '{type(data).__name__}'."
+        return data, None
+    return None, f"ERROR: 지원하지 않는 입력 타입 '{type(data_json)}'. str 또는 {' / '.join(t.__name__ for t in expected_types)} 타입이어야 합니다."
+
+
+# 진행 중인 렌더링/업로드 (동일 digest 요청은 하나의 업로드를 공유)
+_inflight_uploads = {}
+
 
-        # 3. 파일 저장
+async def _run_in_render_thread(fn, *args):
+    """CPU 작업을 이벤트 루프 밖(렌더 전용 스레드 풀)에서 실행"""
+    return await asyncio.get_running_loop().run_in_executor(_render_executor, fn, *args)
+
+
+async def _render_and_upload_url(digest, render):
+    """HTML 생성 → 업로드. (URL, None) 또는 (None, 에러 메시지) 반환"""
+    try:
+        # 대용량 차트는 LTTB/base64 인코딩에 수십 ms가 걸리므로 이벤트 루프 밖에서 생성
         try:
-            save_dir = 'charts'
-            os.makedirs(save_dir, exist_ok=True)
-            filename = gen_unique_filename()
-            file_path = os.path.join(save_dir, filename)
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(html)
+            html = await _run_in_render_thread(render)
         except Exception as e:
-            return f"ERROR: 파일 저장 실패 - {str(e)}"
+            return None, f"ERROR: HTML 생성 실패 - {str(e)}"
 
-        # 4. 업로드 및 URL 생성
+        # 업로드 및 URL 생성 (로컬 파일 없이 메모리에서 바로 전송)
         try:
-            url = upload_to_temp_and_get_url(file_path)
-            # iframe 태그로 감싸서 반환 (크기 조정)
-            iframe_code = f'<iframe src="{url}" style="width:100%;height:500px;border:none;"></iframe>'
-            return iframe_code
-        # [수정됨] requests 예외 대신 표준 urllib 에러 사용
-        except error.URLError as e: 
-             return f"ERROR: 파일 업로드 실패 (네트워크/URL 오류) - {str(e)}"
-        except KeyError as e:
-            return f"ERROR: 업로드 응답 형식 오류 - {str(e)}"
+            url = await upload_to_temp_and_get_url(html, gen_unique_filename())
+            chart_url_cache.set(digest, url)
+            return url, None
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            return None, f"ERROR: 파일 업로드 실패 (네트워크/URL 오류) - {str(e)}"
+        except (KeyError, ValueError) as e:
+            return None, f"ERROR: 업로드 응답 형식 오류 - {str(e)}"
         except Exception as e:
-            return f"ERROR: URL 생성 실패 - {str(e)}"
-            
+            return None, f"ERROR: URL 생성 실패 - {str(e)}"
+    finally:
+        _inflight_uploads.pop(digest, None)
+
+
+async def _render_and_upload(content, render, iframe_height=500):
+    """캐시 확인 → HTML 생성 → 업로드 → iframe 반환 (실패 시 에러 메시지)"""
+    # 대용량 데이터의 정규화 JSON 직렬화는 렌더링보다도 느리므로 해시도 스레드에서 계산
+    digest = await _run_in_render_thread(chart_content_hash, content)
+
+    # 동일한 차트가 이미 업로드되어 있고 URL이 유효하면 바로 반환
+    cached_url = chart_url_cache.get(digest)
+    if cached_url:
+        return _to_iframe(cached_url, iframe_height)
+
+    # 같은 차트를 동시에 요청하면(재시도 등) 업로드를 한 번만 수행
+    task = _inflight_uploads.get(digest)
+    if task is None:
+        task = asyncio.create_task(_render_and_upload_url(digest, render))
+        _inflight_uploads[digest] = task
+    # 한 호출자가 취소되어도 같은 업로드를 기다리는 다른 호출자에게 영향이 없도록 shield
+    url, error = await asyncio.shield(task)
+    if error:
+        return error
+    return _to_iframe(url, iframe_height)
+
+
+@mcp.tool()
+async def generate_chart_html(data_json) -> str:
+    """
+    Chart.js를 사용하여 HTML 차트를 생성하고 업로드된 URL을 반환합니다.
+    
+    지원하는 차트 타입:
+    - 'bar', 'line', 'pie': 기본 차트 (타입 간 전환 버튼 포함)
+    - 'mixed': 여러 데이터셋을 가진 혼합 차트
+    - 'dual_axis': 이중 축 차트
+
+    Args:
+        data_json (str | dict): 차트 데이터 JSON 문자열 또는 딕셔너리 객체
+            (입력 예시는 원본 독스트링 참조)
+            - max_points (int, optional): x축 포인트 수가 이 값을 넘는 line/bar/mixed/dual_axis
+              차트는 LTTB로 다운샘플링하여 렌더링 (기본값: CHART_MAX_POINTS=2000,
+              0이면 다운샘플링하지 않고 원본 그대로 사용, pie 차트에는 적용되지 않음)
+
+    Returns:
+        str: 성공시 iframe HTML 태그, 실패시 에러 메시지
+    """
+
+    try:
+        # 1. JSON 파싱 및 데이터 검증
+        data, parse_error = await _run_in_render_thread(_parse_json_input, data_json, (dict,))
+        if parse_error:
+            return parse_error
+
+        validation_error = validate_chart_data(data)
+        if validation_error:
+            return validation_error
+
+        # 2. HTML 생성 및 업로드
+        return await _render_and_upload(data, lambda: render_chart_html(data))
+
+    except Exception as e:
+        return f"ERROR: 예상치 못한 오류 - {str(e)}"
+
+
+@mcp.tool()
+async def generate_dashboard_html(charts_json, title: str = '') -> str:
+    """
+    여러 차트를 하나의 HTML 대시보드로 생성하고 한 번만 업로드하여 단일 iframe으로 반환합니다.
+    Chart.js는 한 번만 로드되며, 각 차트는 그리드에 배치되어 화면에 보일 때 렌더링됩니다.
+
+    Args:
+        charts_json (str | list): 차트 데이터 목록 (JSON 문자열 또는 리스트).
+            각 항목은 generate_chart_html의 data_json과 동일한 형식 (bar/line/pie/mixed/dual_axis)
+        title (str, optional): 대시보드 제목
+
+    Returns:
+        str: 성공시 iframe HTML 태그, 실패시 에러 메시지
+    """
+
+    try:
+        # 1. JSON 파싱 및 데이터 검증
+        charts, parse_error = await _run_in_render_thread(_parse_json_input, charts_json, (list,))
+        if parse_error:
+            return parse_error
+        if not charts:
+            return "ERROR: 차트 목록이 비어있습니다."
+        if len(charts) > DASHBOARD_MAX_CHARTS:
+            return f"ERROR: 차트가 너무 많습니다 ({len(charts)}개). 최대 {DASHBOARD_MAX_CHARTS}개까지 지원합니다."
+
+        for idx, data in enumerate(charts):
+            if not isinstance(data, dict):
+                return f"ERROR: charts[{idx}] - 차트 데이터는 객체여야 합니다."
+            validation_error = validate_chart_data(data)
+            if validation_error:
+                return f"ERROR: charts[{idx}] - {validation_error.removeprefix('ERROR: ')}"
+
+        # 2. HTML 생성 및 업로드 (2열 기준으로 iframe 높이 산정)
+        rows = (len(charts) + 1) // 2
+        return await _render_and_upload(
+            {'title': title, 'charts': charts},
+            lambda: render_dashboard_html(charts, title),
+            iframe_height=min(rows * DASHBOARD_ROW_HEIGHT + 80, DASHBOARD_MAX_IFRAME_HEIGHT),
+        )
+
     except Exception as e:
-        return f"ERROR: 예상치 못한 오류 - {str(e)}"
\ No newline at end of file
+        return f"ERROR: 예상치 못한 오류 - {str(e)}"
@@ -4,8 +4,11 @@ import shutil
 import json
 import fitz
 import uuid
+import time
+import asyncio
 
-from collections import defaultdict
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
 from datetime import datetime
 from fastapi import Request
 from pydantic import BaseModel
@@ -29,6 +32,24 @@ import platform
 # pdf 변환 대상 확장자
 CONVERTIBLE_EXTENSIONS = ['.hwp', '.txt', '.json', '.md']
 
+# 워커당 동시 인제스천 예산 (환경변수로 조정)
+INGEST_MAX_CONCURRENCY = int(os.getenv('INGEST_MAX_CONCURRENCY', os.cpu_count() or 4))
+INGEST_MEMORY_BUDGET_MB = float(os.getenv('INGEST_MEMORY_BUDGET_MB', '2048'))
+
+# 확장자별 처리 중 메모리 배수 (원본 파일 크기 대비 추정치)
+INGEST_SIZE_MULTIPLIER = {
+    '.pdf': 4,
+    '.doc': 6, '.docx': 6,
+    '.ppt': 6, '.pptx': 6,
+    '.jpg': 10, '.jpeg': 10, '.png': 10,
+    '.txt': 8, '.json': 8, '.md': 8,
+    '.hwp': 10,
+}
+# 페이지당 추가 메모리 추정치 (MB, 페이지 이미지 추출/bbox 검색 포함)
+INGEST_MB_PER_PAGE = 1.5
+# 모든 작업에 붙는 기본 비용 (MB)
+INGEST_BASE_COST_MB = 32
+
 
 def _get_pdf_path(file_path: str) -> str:
     """
@@ -149,10 +170,126 @@ class TextLoader:
                 shutil.rmtree(self.output_dir)
 
 
+# 인제스천 어드미션 컨트롤: 추정 비용(MB)으로 CPU/메모리 예산 안에서만 실행, 나머지는 FIFO 대기
+class IngestionScheduler:
+    def __init__(self, max_concurrency: int = INGEST_MAX_CONCURRENCY,
+                 memory_budget_mb: float = INGEST_MEMORY_BUDGET_MB):
+        self.max_concurrency = max(1, max_concurrency)
+        self.memory_budget_mb = memory_budget_mb
+        self._waiters = deque()  # [cost, future, enqueued_at]
+        self._running = 0
+        self._memory_in_use = 0.0
+        self._admitted = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    # 파일 크기, 페이지 수, 확장자로 처리 중 메모리 사용량(MB) 추정
+    def estimate_cost(self, file_path: str) -> float:
+        ext = os.path.splitext(file_path)[-1].lower()
+        size_mb = os.path.getsize(file_path) / (1024 * 1024) if os.path.exists(file_path) else 0.0
+
+        n_pages = 1
+        if ext == '.pdf':
+            try:
+                with fitz.open(file_path) as doc:
+                    n_pages = len(doc)
+            except Exception:
+                pass
+
+        cost = INGEST_BASE_COST_MB + size_mb * INGEST_SIZE_MULTIPLIER.get(ext, 6) + n_pages * INGEST_MB_PER_PAGE
+        # 예산보다 큰 파일도 단독으로는 실행될 수 있도록 상한 적용
+        return min(cost, self.memory_budget_mb)
+
+    def _fits(self, cost: float) -> bool:
+        if self._running >= self.max_concurrency:
+            return False
+        # 아무것도 실행 중이 아니면 항상 허용 (기아 방지)
+        return self._running == 0 or self._memory_in_use + cost <= self.memory_budget_mb
+
+    def _grant(self, cost: float, waited: float):
+        self._running += 1
+        self._memory_in_use += cost
+        self._admitted += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def _release(self, cost: float):
+        self._running -= 1
+        self._memory_in_use = max(0.0, self._memory_in_use - cost)
+        self._wake()
+
+    # 큐 선두부터 예산에 맞는 만큼 순서대로 허용 (앞 작업을 추월하지 않음)
+    def _wake(self):
+        while self._waiters:
+            cost, fut, enqueued_at = self._waiters[0]
+            if fut.done():
+                self._waiters.popleft()
+                continue
+            if not self._fits(cost):
+                break
+            self._waiters.popleft()
+            self._grant(cost, time.monotonic() - enqueued_at)
+            fut.set_result(None)
+
+    async def acquire(self, cost: float):
+        if not self._waiters and self._fits(cost):
+            self._grant(cost, 0.0)
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        entry = [cost, fut, time.monotonic()]
+        self._waiters.append(entry)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.cancelled():
+                # 대기 중 취소: 큐에서 제거하고 뒤 작업에 기회를 넘김
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                self._wake()
+            else:
+                # 허용 직후 취소: 확보한 예산 반환
+                self._release(cost)
+            raise
+
+    def release(self, cost: float):
+        self._release(cost)
+
+    @asynccontextmanager
+    async def admit(self, file_path: str):
+        cost = self.estimate_cost(file_path)
+        await self.acquire(cost)
+        try:
+            yield cost
+        finally:
+            self.release(cost)
+
+    # 오토스케일링/모니터링용 지표
+    def stats(self) -> dict:
+        now = time.monotonic()
+        oldest_wait = now - self._waiters[0][2] if self._waiters else 0.0
+        return {
+            'queue_depth': len(self._waiters),
+            'running': self._running,
+            'memory_in_use_mb': round(self._memory_in_use, 1),
+            'memory_budget_mb': self.memory_budget_mb,
+            'max_concurrency': self.max_concurrency,
+            'admitted_total': self._admitted,
+            'avg_wait_sec': self._total_wait / self._admitted if self._admitted else 0.0,
+            'max_wait_sec': self._max_wait,
+            'oldest_wait_sec': oldest_wait,
+        }
+
+
+# 워커 프로세스 전체에서 공유하는 스케줄러
+ingestion_scheduler = IngestionScheduler()
+
+
 # 구조 요약 (상위 → 하위)
 class DocumentProcessor:
-    def __init__(self):
+    def __init__(self, scheduler: IngestionScheduler | None = None):
         self.page_chunk_counts = defaultdict(int)
+        self.scheduler = scheduler or ingestion_scheduler
 
     # 파일 확장자에 맞는 로더 반환
     def get_loader(self, file_path: str):
@@ -337,8 +474,14 @@ class DocumentProcessor:
 
         return vectors
 
-    # 위 단계들을 순차적으로 실행해 최종 vectors 반환 (이미지 메타 병합 포함)
+    # 스케줄러의 허용을 받은 뒤 처리 (예산 초과 시 큐에서 대기)
     async def __call__(self, request: Request, file_path: str, **kwargs: dict):
+        async with self.scheduler.admit(file_path):
+            await assert_cancelled(request)
+            return await self._process(request, file_path, **kwargs)
+
+    # 위 단계들을 순차적으로 실행해 최종 vectors 반환 (이미지 메타 병합 포함)
+    async def _process(self, request: Request, file_path: str, **kwargs: dict):
         documents: list[Document] = self.load_documents(file_path, **kwargs)
         await assert_cancelled(request)
 
@@ -0,0 +1,477 @@
+# 에이전트 도구(generate_chart_html, PubChem_search_compounds, DocumentProcessor)의 동시 부하 테스트 도구입니다.
+# 외부 서비스(CDN 업로드, genos_utils.upload_files, PubChem MCP 서버)는 지연/실패율을 주입할 수 있는 로컬 대역으로 대체합니다.
+#
+# 사용 예:
+#   python loadtest.py --target all --concurrency 16 --rate 20 --requests 200 --latency-ms 80 --failure-rate 0.02
+#   python loadtest.py --target chart --concurrency 32 --requests 500 --json
+#   python loadtest.py --target pubchem --trace-mem   # tracemalloc 측정은 별도 패스로 수행
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import types
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+CHART_TOOL_PATH = os.path.join(ROOT_DIR, 'KIC', 'tool_get_iframe_tag.py')
+PUBCHEM_TOOL_PATH = os.path.join(ROOT_DIR, 'KIC', 'PubChem_search_compounds.py')
+
+TARGETS = ['chart', 'pubchem', 'document']
+
+# 대역 서비스의 지연/실패율 (PubChem 대역 서버는 별도 프로세스이므로 환경변수로 전달)
+STUB_LATENCY_ENV = 'LOADTEST_STUB_LATENCY_MS'
+STUB_FAILURE_ENV = 'LOADTEST_STUB_FAILURE_RATE'
+# 이 값이 '1'인 환경에서 실행되면 PubChem MCP 서버 대역으로 동작
+PUBCHEM_STUB_ENV = 'LOADTEST_PUBCHEM_STUB'
+
+
+# ---------------------------------------------------------------------------
+# 로컬 대역 서비스
+# ---------------------------------------------------------------------------
+
+def _stub_delay(latency_ms):
+    # 평균 latency_ms 부근에서 흔들리는 지연 (0.5x ~ 1.5x)
+    return latency_ms / 1000.0 * random.uniform(0.5, 1.5)
+
+
+def run_pubchem_stub_server():
+    """PubChem MCP 서버 대역 (stdio). MCPSessionPool이 이 프로세스를 띄워 사용한다"""
+    from mcp.server.fastmcp import FastMCP
+
+    latency_ms = float(os.getenv(STUB_LATENCY_ENV, '0'))
+    failure_rate = float(os.getenv(STUB_FAILURE_ENV, '0'))
+    server = FastMCP('pubchem-stub', log_level='WARNING')
+
+    @server.tool()
+    async def search_compounds(query: str, search_type: str = 'name', max_records: int = 100) -> str:
+        await asyncio.sleep(_stub_delay(latency_ms))
+        if random.random() < failure_rate:
+            raise RuntimeError('injected PubChem failure')
+        compounds = [
+            {
+                'cid': 1000 + i,
+                'iupac_name': f'{query}-{i}',
+                'molecular_formula': 'C9H8O4',
+                'molecular_weight': 180.16,
+                'canonical_smiles': 'CC(=O)OC1=CC=CC=C1C(=O)O',
+            }
+            for i in range(min(max_records, 5))
+        ]
+        return json.dumps({'query': query, 'search_type': search_type,
+                           'total_found': len(compounds), 'compounds': compounds})
+
+    server.run()
+
+
+class _CdnStubHandler(BaseHTTPRequestHandler):
+    """llmops-cdn-api-service 업로드 엔드포인트 대역"""
+    protocol_version = 'HTTP/1.1'
+    latency_ms = 0.0
+    failure_rate = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        # 서버 스레드에서 지연시키므로 클라이언트 이벤트 루프는 막히지 않는다
+        time.sleep(_stub_delay(self.latency_ms))
+        if random.random() < self.failure_rate:
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = json.dumps({'data': {'presigned_url': f'http://cdn.local/temp/{time.time_ns()}.html'}}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_cdn_stub(latency_ms, failure_rate):
+    handler = type('CdnStubHandler', (_CdnStubHandler,), {'latency_ms': latency_ms, 'failure_rate': failure_rate})
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def install_genos_utils_stub(latency_ms, failure_rate):
+    """genos_utils.upload_files 대역 (merge_overlapping_bboxes는 입력을 그대로 반환)"""
+    module = types.ModuleType('genos_utils')
+
+    async def upload_files(file_list, request=None):
+        await asyncio.sleep(_stub_delay(latency_ms))
+        for f in file_list:
+            if os.path.exists(f['path']):
+                os.remove(f['path'])
+        if random.random() < failure_rate:
+            raise RuntimeError('injected upload_files failure')
+
+    def merge_overlapping_bboxes(bboxes, x_tolerance=0, y_tolerance=0):
+        return bboxes
+
+    module.upload_files = upload_files
+    module.merge_overlapping_bboxes = merge_overlapping_bboxes
+    sys.modules['genos_utils'] = module
+
+    # 플랫폼 밖에서 실행할 때만 utils.assert_cancelled 대역 사용
+    try:
+        import utils  # noqa: F401
+    except ImportError:
+        utils_stub = types.ModuleType('utils')
+
+        async def assert_cancelled(request):
+            return None
+
+        utils_stub.assert_cancelled = assert_cancelled
+        sys.modules['utils'] = utils_stub
+
+
+class _StubRequest:
+    async def is_disconnected(self):
+        return False
+
+
+class _StubMCP:
+    """도구 파일의 @mcp.tool() 데코레이터를 그대로 통과시키는 대역"""
+
+    def tool(self, *args, **kwargs):
+        return lambda fn: fn
+
+
+def load_tool_module(path, name):
+    module = types.ModuleType(name)
+    module.__file__ = path
+    module.mcp = _StubMCP()
+    with open(path, encoding='utf-8') as f:
+        exec(compile(f.read(), path, 'exec'), module.__dict__)
+    return module
+
+
+# ---------------------------------------------------------------------------
+# 측정
+# ---------------------------------------------------------------------------
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * p / 100.0
+    lo, hi = int(k), min(int(k) + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+class LoopLagMonitor:
+    """주기적으로 sleep 하면서 예정보다 늦게 깨어난 시간으로 이벤트 루프 블로킹을 측정"""
+
+    def __init__(self, interval=0.01, threshold=0.005):
+        self.interval = interval
+        self.threshold = threshold
+        self.lags = []
+        self.blocked_total = 0.0
+        self._task = None
+
+    async def _run(self):
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = time.perf_counter() - start - self.interval
+            self.lags.append(max(lag, 0.0))
+            if lag > self.threshold:
+                self.blocked_total += lag
+
+    def start(self):
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+
+    def report(self):
+        return {
+            'blocked_total_sec': round(self.blocked_total, 3),
+            'lag_p99_ms': round(percentile(self.lags, 99) * 1000, 2),
+            'lag_max_ms': round(max(self.lags, default=0.0) * 1000, 2),
+        }
+
+
+def _current_rss_mb():
+    """현재 RSS (Linux는 /proc/self/statm, 그 외에는 ru_maxrss 최대값으로 대체)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss 단위: Linux KB, macOS bytes
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 if sys.platform != 'darwin' else 1024 * 1024)
+
+
+class RssSampler:
+    """이벤트 루프 측정에 섞이지 않도록 별도 스레드에서 주기적으로 RSS를 기록"""
+
+    def __init__(self, interval=0.05):
+        self.interval = interval
+        self.samples = []
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.samples.append(_current_rss_mb())
+            self._stop.wait(self.interval)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+
+def _is_error(result):
+    return isinstance(result, str) and result.lstrip().upper().startswith('ERROR')
+
+
+# ---------------------------------------------------------------------------
+# 대상별 요청 생성
+# ---------------------------------------------------------------------------
+
+def make_chart_call(module, distinct, n_points):
+    def call(i):
+        seed = i % distinct if distinct else i
+        rng = random.Random(seed)
+        chart_type = rng.choice(['bar', 'line', 'mixed'])
+        x_values = list(range(n_points))
+        if chart_type == 'mixed':
+            data = {'chart_type': 'mixed', 'title': f'load-{seed}', 'x_values': x_values,
+                    'datasets': [{'label': 'a', 'type': 'bar', 'data': [rng.random() for _ in x_values]},
+                                 {'label': 'b', 'type': 'line', 'data': [rng.random() for _ in x_values]}]}
+        else:
+            data = {'chart_type': chart_type, 'title': f'load-{seed}', 'x_values': x_values,
+                    'y_values': [rng.random() for _ in x_values]}
+        return module.generate_chart_html(data)
+    return call
+
+
+def make_pubchem_call(module, distinct):
+    def call(i):
+        seed = i % distinct if distinct else i
+        return module.PubChem_search_compounds(f'compound-{seed}')
+    return call
+
+
+def make_document_files(n_files, pages):
+    import fitz
+
+    out_dir = tempfile.mkdtemp(prefix='loadtest_docs_')
+    pix = fitz.Pixmap(fitz.csRGB, fitz.IRect(0, 0, 64, 64), False)
+    pix.clear_with(180)
+    paths = []
+    for f in range(n_files):
+        doc = fitz.open()
+        for p in range(pages):
+            page = doc.new_page()
+            page.insert_text((72, 72), f'Load test document {f} page {p}\n' + 'lorem ipsum dolor sit amet ' * 40)
+            page.insert_image(fitz.Rect(72, 400, 200, 528), pixmap=pix)
+        path = os.path.join(out_dir, f'doc_{f}.pdf')
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+
+def make_document_call(module, paths):
+    request = _StubRequest()
+
+    def call(i):
+        processor = module.DocumentProcessor()
+        return processor(request, paths[i % len(paths)])
+    return call
+
+
+# ---------------------------------------------------------------------------
+# 부하 생성
+# ---------------------------------------------------------------------------
+
+async def drive(name, call, n_requests, concurrency, rate, index_offset=0):
+    """
+    rate > 0 이면 포아송 도착(open loop), 0 이면 concurrency 만큼 연속 호출(closed loop).
+    지연은 도착(태스크 생성) 시점부터 측정하며, 세마포어 대기 시간은 queue_*로 따로 보고한다.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    queue_waits = []
+    errors = 0
+
+    async def one(i, arrival):
+        nonlocal errors
+        async with semaphore:
+            queue_waits.append(time.perf_counter() - arrival)
+            try:
+                result = await call(i)
+                if _is_error(result):
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - arrival)
+
+    started = time.perf_counter()
+    tasks = []
+    for i in range(n_requests):
+        tasks.append(asyncio.create_task(one(index_offset + i, time.perf_counter())))
+        if rate > 0:
+            await asyncio.sleep(random.expovariate(rate))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    return {
+        'target': name,
+        'requests': n_requests,
+        'errors': errors,
+        'elapsed_sec': round(elapsed, 3),
+        'throughput_rps': round(n_requests / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 1),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 1),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 1),
+        'queue_p50_ms': round(percentile(queue_waits, 50) * 1000, 1),
+        'queue_p95_ms': round(percentile(queue_waits, 95) * 1000, 1),
+    }
+
+
+async def run(args):
+    targets = TARGETS if args.target == 'all' else [args.target]
+    os.environ[STUB_LATENCY_ENV] = str(args.latency_ms)
+    os.environ[STUB_FAILURE_ENV] = str(args.failure_rate)
+
+    calls = {}
+    # 정리 작업은 등록 역순으로 실행
+    cleanups = contextlib.AsyncExitStack()
+
+    if 'chart' in targets:
+        cdn = start_cdn_stub(args.latency_ms, args.failure_rate)
+        os.environ['CHART_UPLOAD_URL'] = f'http://127.0.0.1:{cdn.server_port}/minio/upload/temp'
+        os.environ.setdefault('CHART_UPLOAD_BACKOFF_BASE', '0.05')
+        chart_module = load_tool_module(CHART_TOOL_PATH, 'loadtest_chart_tool')
+        calls['chart'] = make_chart_call(chart_module, args.distinct, args.chart_points)
+        cleanups.callback(cdn.shutdown)
+        cleanups.push_async_callback(chart_module.close_upload_client)
+
+    if 'pubchem' in targets:
+        os.environ['PUBCHEM_MCP_COMMAND'] = sys.executable
+        os.environ['PUBCHEM_MCP_SERVER_PATH'] = os.path.abspath(__file__)
+        os.environ[PUBCHEM_STUB_ENV] = '1'
+        os.environ.setdefault('PUBCHEM_MAX_RPS', '0')
+        pubchem_module = load_tool_module(PUBCHEM_TOOL_PATH, 'loadtest_pubchem_tool')
+        calls['pubchem'] = make_pubchem_call(pubchem_module, args.distinct)
+        # 호스트와 같은 방식으로 lifespan에 서버 프로세스 정리를 맡긴다
+        await cleanups.enter_async_context(pubchem_module.pubchem_lifespan())
+        # 서버 기동 시간이 지연 분포에 섞이지 않도록 풀의 모든 세션을 미리 띄운다 (캐시 우회)
+        pool = pubchem_module.pubchem_session_pool
+        await asyncio.gather(*(pool.call_tool('search_compounds', {'query': 'warmup'}) for _ in range(pool.size)),
+                             return_exceptions=True)
+
+    if 'document' in targets:
+        install_genos_utils_stub(args.latency_ms, args.failure_rate)
+        sys.path.insert(0, ROOT_DIR)
+        import basic_preprocessor_actual
+        paths = make_document_files(args.doc_files, args.doc_pages)
+        cleanups.callback(shutil.rmtree, os.path.dirname(paths[0]), ignore_errors=True)
+        calls['document'] = make_document_call(basic_preprocessor_actual, paths)
+
+    monitor = LoopLagMonitor()
+    monitor.start()
+    rss = RssSampler()
+    rss.start()
+
+    results = []
+    for name in targets:
+        # 지연/루프 지연 수치는 tracemalloc 없이 측정 (할당마다 훅이 걸려 수 배 느려짐)
+        lag_before, lags_before = monitor.blocked_total, len(monitor.lags)
+        rss_before = len(rss.samples)
+        report = await drive(name, calls[name], args.requests, args.concurrency, args.rate)
+        report['loop_blocked_sec'] = round(monitor.blocked_total - lag_before, 3)
+        window = monitor.lags[lags_before:]
+        report['loop_lag_max_ms'] = round(max(window, default=0.0) * 1000, 2)
+        report['rss_peak_mb'] = round(max(rss.samples[rss_before:], default=_current_rss_mb()), 1)
+
+        if args.trace_mem:
+            # 별도 패스: 첫 패스와 다른 인덱스로 호출해 캐시 히트만 재는 일이 없도록 함
+            tracemalloc.start()
+            await drive(name, calls[name], args.requests, args.concurrency, args.rate, index_offset=args.requests)
+            report['py_mem_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+            tracemalloc.stop()
+        results.append(report)
+
+    await monitor.stop()
+    rss.stop()
+    await cleanups.aclose()
+
+    return {
+        'config': vars(args),
+        'results': results,
+        'loop': monitor.report(),
+        # ru_maxrss 단위: Linux KB, macOS bytes
+        'max_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 if sys.platform != 'darwin' else 1024 * 1024), 1),
+    }
+
+
+def print_report(summary):
+    columns = ['target', 'requests', 'errors', 'elapsed_sec', 'throughput_rps',
+               'p50_ms', 'p95_ms', 'p99_ms', 'queue_p50_ms', 'queue_p95_ms',
+               'loop_blocked_sec', 'loop_lag_max_ms', 'rss_peak_mb']
+    if summary['config']['trace_mem']:
+        columns.append('py_mem_peak_mb')
+    rows = [[str(r[c]) for c in columns] for r in summary['results']]
+    widths = [max(len(c), *(len(row[i]) for row in rows)) for i, c in enumerate(columns)]
+    print('  '.join(c.ljust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print('  '.join(v.ljust(w) for v, w in zip(row, widths)))
+    print(f"\nevent loop: {summary['loop']}")
+    print(f"max RSS: {summary['max_rss_mb']} MB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Concurrent load test for agent tools with local service stand-ins')
+    parser.add_argument('--target', choices=TARGETS + ['all'], default='all')
+    parser.add_argument('--requests', type=int, default=100, help='요청 수 (대상별)')
+    parser.add_argument('--concurrency', type=int, default=10, help='동시 실행 상한')
+    parser.add_argument('--rate', type=float, default=0.0, help='초당 도착률 (0이면 closed loop)')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='대역 서비스 평균 지연')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='대역 서비스 실패율 (0~1)')
+    parser.add_argument('--distinct', type=int, default=0, help='서로 다른 payload 수 (0이면 모두 다름, 캐시 효과 측정용)')
+    parser.add_argument('--chart-points', type=int, default=500, help='차트당 데이터 포인트 수')
+    parser.add_argument('--doc-files', type=int, default=4, help='생성할 테스트 PDF 수')
+    parser.add_argument('--doc-pages', type=int, default=5, help='테스트 PDF 페이지 수')
+    parser.add_argument('--trace-mem', action='store_true',
+                        help='tracemalloc으로 파이썬 힙 최대치를 별도 패스에서 측정 (지연 수치에는 영향 없음)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    return parser.parse_args(argv)
+
+
+if __name__ == '__main__':
+    if os.getenv(PUBCHEM_STUB_ENV) == '1':
+        run_pubchem_stub_server()
+        sys.exit(0)
+
+    args = parse_args()
+    summary = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print_report(summary)